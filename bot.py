@@ -387,7 +387,7 @@ class Bot(commands.Bot):
 
                     if channel := self.get_channel(channel_name):
                         await channel.send(message)
-                        await self.tts_manager.speak(f"Now {new_phase}")
+                        await self.tts_manager.speak(f"Now {new_phase}", metadata={'channel': 'flight_phase'})
 
             elif event_type == 'milestone':
                 milestone = event_data.get('milestone', '')
@@ -43,6 +43,11 @@ class DatabaseManager:
         self._backup_task: Optional[asyncio.Task] = None
         self._metrics_task: Optional[asyncio.Task] = None
 
+    @property
+    def is_connected(self) -> bool:
+        """Whether the MongoDB connection is currently established."""
+        return self._connected.is_set()
+
     async def connect(self) -> None:
         """Connect to MongoDB with retry mechanism."""
         while self._connection_retries < self._max_retries:
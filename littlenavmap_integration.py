@@ -4,13 +4,134 @@ import asyncio
 import json
 import logging
 import time
-from typing import Any, Dict, List, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 import aiohttp
+import msgspec
+from cachetools import TTLCache
 from config import Config
 
+# Unit conversions applied at the output boundary; the snapshot stores SI.
+MS_TO_KT = 1.943844     # m/s to knots
+MS_TO_FPM = 196.85      # m/s to ft/min
+KM_TO_NM = 0.539957     # km to nautical miles
+
+
+class Position(msgspec.Struct):
+    """Aircraft position block of a LittleNavmap response."""
+    lat: float = 0.0
+    lon: float = 0.0
+
+
+class Telemetry(msgspec.Struct):
+    """Typed view of the LittleNavmap aircraft payload; unknown keys are ignored."""
+    indicated_altitude: float = 0.0
+    altitude_above_ground: float = 0.0
+    ground_altitude: float = 0.0
+    ground_speed: float = 0.0
+    true_airspeed: float = 0.0
+    indicated_speed: float = 0.0
+    heading: float = 0.0
+    vertical_speed: float = 0.0
+    position: Position = msgspec.field(default_factory=Position)
+    wind_speed: float = 0.0
+    wind_direction: float = 0.0
+    on_ground: bool = False
+    next_wp_name: str = ''
+    destination_distance: float = 0.0
+    fuel_remaining: float = 0.0
+    ete_hours: float = 0.0
+
+
+_TELEMETRY_FLOAT_FIELDS = tuple(
+    f.name for f in msgspec.structs.fields(Telemetry) if f.type is float
+)
+
+# Every raw field the snapshot, formatters and listeners read (position is hashed separately)
+_SIGNATURE_FIELDS = tuple(
+    f.name for f in msgspec.structs.fields(Telemetry) if f.name != 'position'
+) + ('phase',)
+
+
+@dataclass
+class FlightSnapshot:
+    """Normalized flight data as reported by LittleNavmap (SI speeds/distances)."""
+    altitude_ft: float = 0.0
+    altitude_agl_ft: float = 0.0
+    ground_altitude_ft: float = 0.0
+    speed_ms: float = 0.0
+    true_airspeed_ms: float = 0.0
+    indicated_airspeed_ms: float = 0.0
+    heading_deg: float = 0.0
+    vertical_speed_ms: float = 0.0
+    latitude: float = 0.0
+    longitude: float = 0.0
+    wind_speed_ms: float = 0.0
+    wind_direction_deg: float = 0.0
+    on_ground: bool = False
+    phase: str = 'unknown'
+    next_waypoint: str = ''
+    distance_km: float = 0.0
+    fuel_remaining_lbs: float = 0.0
+    ete_hours: float = 0.0
+    raw_data: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def speed_kt(self) -> float:
+        return self.speed_ms * MS_TO_KT
+
+    @property
+    def true_airspeed_kt(self) -> float:
+        return self.true_airspeed_ms * MS_TO_KT
+
+    @property
+    def indicated_airspeed_kt(self) -> float:
+        return self.indicated_airspeed_ms * MS_TO_KT
+
+    @property
+    def vertical_speed_fpm(self) -> float:
+        return self.vertical_speed_ms * MS_TO_FPM
+
+    @property
+    def wind_speed_kt(self) -> float:
+        return self.wind_speed_ms * MS_TO_KT
+
+    @property
+    def distance_to_dest_nm(self) -> float:
+        return self.distance_km * KM_TO_NM
+
+    @property
+    def ete_minutes(self) -> float:
+        return self.ete_hours * 60
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Legacy dict view with display units, used for event payloads."""
+        return {
+            'altitude_ft': self.altitude_ft,
+            'altitude_agl_ft': self.altitude_agl_ft,
+            'ground_altitude_ft': self.ground_altitude_ft,
+            'speed_kt': self.speed_kt,
+            'true_airspeed_kt': self.true_airspeed_kt,
+            'indicated_airspeed_kt': self.indicated_airspeed_kt,
+            'heading_deg': self.heading_deg,
+            'vertical_speed_fpm': self.vertical_speed_fpm,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'wind_speed_kt': self.wind_speed_kt,
+            'wind_direction_deg': self.wind_direction_deg,
+            'on_ground': self.on_ground,
+            'phase': self.phase,
+            'next_waypoint': self.next_waypoint,
+            'distance_to_dest_nm': self.distance_to_dest_nm,
+            'fuel_remaining_lbs': self.fuel_remaining_lbs,
+            'ete_minutes': self.ete_minutes,
+            'raw_data': self.raw_data
+        }
+
+
 class LittleNavmapIntegration:
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, session: Optional[aiohttp.ClientSession] = None):
         self.logger = logging.getLogger('LittleNavmapIntegration')
         self.config = config
         self.base_url = getattr(config, 'LITTLENAVMAP_URL', None) or \
@@ -18,23 +139,36 @@ class LittleNavmapIntegration:
         self.poll_interval = getattr(config, 'LITTLENAVMAP_POLL_INTERVAL', None) or \
                             getattr(config.littlenavmap, 'UPDATE_INTERVAL', 1.0)
 
-        self.session: Optional[aiohttp.ClientSession] = None
+        # A caller-provided session is shared (e.g. with GeographicIntelligence) and not closed here
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
         self._poll_task: Optional[asyncio.Task] = None
-        self._listeners: List[Callable] = []
+        # Immutable snapshots, rebuilt on (un)registration so fan-out can iterate safely
+        self._sync_listeners: Tuple[Callable, ...] = ()
+        self._async_listeners: Tuple[Callable, ...] = ()
         self._last_data: Dict[str, Any] = {}
+        self._last_sig: Optional[int] = None
         self._last_milestones: Dict[str, bool] = {}
         self._last_phase: Optional[str] = None
-        self._flight_data_cache: Dict[str, Any] = {}
+        self._phase_title: str = 'Unknown'
+        self._wind_key: Optional[tuple] = None
+        self._wind_text: str = ''
+        self._flight_data_cache: Optional[FlightSnapshot] = None
+        # Legacy dict view of the snapshot it was built from; rebuilt only when the snapshot changes
+        self._flight_data_view: Tuple[Optional[FlightSnapshot], Optional[Dict[str, Any]]] = (None, None)
+        self._tick_iso: str = ''  # Shared event timestamp for the current poll tick
 
         # Airport API configuration
         self.airport_api_key = getattr(config, 'AIRPORT_API_KEY', None)
+        self._airport_cache = TTLCache(maxsize=128, ttl=3600)
+        # In-flight airport fetches; each removes itself once done
+        self._airport_fetches: Dict[str, asyncio.Task] = {}
 
     async def start(self):
         """Start polling LittleNavmap for data."""
         if self.session is None:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=10)
-            )
+            # Same keep-alive connector as the shared session, so every poll reuses a warm socket
+            self.session = create_shared_session()
         if self._poll_task is None:
             self._poll_task = asyncio.create_task(self._poll_loop())
             self.logger.info(f"Started LittleNavmap polling on {self.base_url}")
@@ -49,7 +183,7 @@ class LittleNavmapIntegration:
                 pass
             self._poll_task = None
 
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
             self.session = None
         self.logger.info("Stopped LittleNavmap integration")
@@ -64,7 +198,10 @@ class LittleNavmapIntegration:
                 # Try multiple endpoints for compatibility
                 data = await self._fetch_data_with_fallback()
 
-                if data and data != self._last_data:
+                sig = self._data_signature(data) if data else None
+                if data and sig != self._last_sig:
+                    self._tick_iso = datetime.now().isoformat(timespec='seconds')
+                    self._last_sig = sig
                     self._last_data = data
                     self._update_flight_data_cache(data)
                     await self._notify_listeners(data)
@@ -88,6 +225,12 @@ class LittleNavmapIntegration:
                 else:
                     await asyncio.sleep(5)
 
+    @staticmethod
+    def _data_signature(data: Dict[str, Any]) -> int:
+        """Cheap hash of the fields that drive updates, used instead of a full dict compare."""
+        position = data.get('position') or {}
+        return hash((*map(data.get, _SIGNATURE_FIELDS), position.get('lat'), position.get('lon')))
+
     async def _fetch_data_with_fallback(self) -> Dict[str, Any]:
         """Try multiple endpoints for data with fallback."""
         endpoints = [
@@ -116,35 +259,53 @@ class LittleNavmapIntegration:
         if not self.session:
             raise RuntimeError("Session not initialized")
 
-        async with self.session.get(url) as resp:
-            resp.raise_for_status()
-            return await resp.json()
+        # Status check instead of raise_for_status keeps exceptions off the fallback path
+        async with self.session.get(url, allow_redirects=False) as resp:
+            if resp.status != 200:
+                return {}
+            return await resp.json(loads=msgspec.json.decode)
+
+    def _decode_telemetry(self, data: Dict[str, Any]) -> Telemetry:
+        """Convert a raw payload into typed telemetry with float coercion."""
+        try:
+            return msgspec.convert(data, type=Telemetry, strict=False)
+        except msgspec.ValidationError:
+            # Nulls or junk values: fall back to lenient per-field coercion
+            f = self._safe_float
+            position = data.get('position') or {}
+            return Telemetry(
+                position=Position(lat=f(position.get('lat')), lon=f(position.get('lon'))),
+                on_ground=bool(data.get('on_ground', False)),
+                next_wp_name=data.get('next_wp_name') or '',
+                **{name: f(data.get(name)) for name in _TELEMETRY_FLOAT_FIELDS}
+            )
 
     def _update_flight_data_cache(self, data: Dict[str, Any]):
-        """Update cached flight data with normalized values."""
+        """Update cached flight snapshot with normalized SI values."""
         try:
-            # Convert to standardized units and cache
-            self._flight_data_cache = {
-                'altitude_ft': self._safe_float(data.get('indicated_altitude', 0)),
-                'altitude_agl_ft': self._safe_float(data.get('altitude_above_ground', 0)),
-                'ground_altitude_ft': self._safe_float(data.get('ground_altitude', 0)),
-                'speed_kt': self._safe_float(data.get('ground_speed', 0)) * 1.943844,  # m/s to knots
-                'true_airspeed_kt': self._safe_float(data.get('true_airspeed', 0)) * 1.943844,
-                'indicated_airspeed_kt': self._safe_float(data.get('indicated_speed', 0)) * 1.943844,
-                'heading_deg': self._safe_float(data.get('heading', 0)),
-                'vertical_speed_fpm': self._safe_float(data.get('vertical_speed', 0)) * 196.85,  # m/s to ft/min
-                'latitude': self._safe_float(data.get('position', {}).get('lat')),
-                'longitude': self._safe_float(data.get('position', {}).get('lon')),
-                'wind_speed_kt': self._safe_float(data.get('wind_speed', 0)) * 1.943844,
-                'wind_direction_deg': self._safe_float(data.get('wind_direction', 0)),
-                'on_ground': data.get('on_ground', False) or self._flight_data_cache.get('altitude_agl_ft', 0) < 5,
-                'phase': await self._detect_flight_phase(self._flight_data_cache),
-                'next_waypoint': data.get('next_wp_name', ''),
-                'distance_to_dest_nm': self._safe_float(data.get('destination_distance', 0)) * 0.539957,  # km to nm
-                'fuel_remaining_lbs': self._safe_float(data.get('fuel_remaining', 0)),
-                'ete_minutes': self._safe_float(data.get('ete_hours', 0)) * 60,
-                'raw_data': data
-            }
+            t = self._decode_telemetry(data)
+            snapshot = FlightSnapshot(
+                altitude_ft=t.indicated_altitude,
+                altitude_agl_ft=t.altitude_above_ground,
+                ground_altitude_ft=t.ground_altitude,
+                speed_ms=t.ground_speed,
+                true_airspeed_ms=t.true_airspeed,
+                indicated_airspeed_ms=t.indicated_speed,
+                heading_deg=t.heading,
+                vertical_speed_ms=t.vertical_speed,
+                latitude=t.position.lat,
+                longitude=t.position.lon,
+                wind_speed_ms=t.wind_speed,
+                wind_direction_deg=t.wind_direction,
+                on_ground=t.on_ground or t.altitude_above_ground < 5,
+                next_waypoint=t.next_wp_name,
+                distance_km=t.destination_distance,
+                fuel_remaining_lbs=t.fuel_remaining,
+                ete_hours=t.ete_hours,
+                raw_data=data
+            )
+            snapshot.phase = self._detect_flight_phase(snapshot)
+            self._flight_data_cache = snapshot
         except Exception as e:
             self.logger.error(f"Error updating flight data cache: {e}")
 
@@ -155,12 +316,12 @@ class LittleNavmapIntegration:
         except (ValueError, TypeError):
             return 0.0
 
-    async def _detect_flight_phase(self, flight_data: Dict[str, Any]) -> str:
+    def _detect_flight_phase(self, snapshot: FlightSnapshot) -> str:
         """Enhanced flight phase detection."""
-        altitude_agl = flight_data.get('altitude_agl_ft', 0)
-        ground_speed = flight_data.get('speed_kt', 0)
-        vertical_speed = flight_data.get('vertical_speed_fpm', 0)
-        on_ground = flight_data.get('on_ground', False)
+        altitude_agl = snapshot.altitude_agl_ft
+        ground_speed = snapshot.speed_kt
+        vertical_speed = snapshot.vertical_speed_fpm
+        on_ground = snapshot.on_ground
 
         # Use API-provided phase if available
         if 'phase' in self._last_data:
@@ -189,26 +350,30 @@ class LittleNavmapIntegration:
     async def _check_milestones_and_phases(self, data: Dict[str, Any]):
         """Check for milestone announcements and phase changes."""
         try:
-            current_phase = self._flight_data_cache.get('phase', 'unknown')
+            snapshot = self._flight_data_cache
+            if snapshot is None:
+                return
+            current_phase = snapshot.phase
 
             # Phase change detection
             if current_phase != self._last_phase:
                 self.logger.info(f"Flight phase changed: {self._last_phase} → {current_phase}")
                 await self._notify_phase_change(self._last_phase, current_phase)
                 self._last_phase = current_phase
+                self._phase_title = current_phase.title()
 
             # Milestone announcements
-            announcements = await self._check_milestones(self._flight_data_cache)
+            announcements = self._check_milestones(snapshot)
             for announcement in announcements:
                 await self._notify_milestone(announcement)
 
         except Exception as e:
             self.logger.error(f"Error checking milestones and phases: {e}")
 
-    async def _check_milestones(self, flight_data: Dict[str, Any]) -> List[str]:
+    def _check_milestones(self, snapshot: FlightSnapshot) -> List[str]:
         """Check for various flight milestones."""
         announcements = []
-        altitude_ft = flight_data.get('altitude_ft', 0)
+        altitude_ft = snapshot.altitude_ft
 
         # Flight level milestones (every 1000 ft above 10,000 ft)
         if altitude_ft >= 10000:
@@ -226,7 +391,7 @@ class LittleNavmapIntegration:
                 del self._last_milestones[key]
 
         # Waypoint milestone
-        waypoint = flight_data.get('next_waypoint', '')
+        waypoint = snapshot.next_waypoint
         if waypoint and not self._last_milestones.get(f"WP_{waypoint}", False):
             announcements.append(f"Approaching waypoint {waypoint}")
             self._last_milestones[f"WP_{waypoint}"] = True
@@ -235,12 +400,14 @@ class LittleNavmapIntegration:
 
     async def _notify_listeners(self, data: Dict[str, Any]):
         """Call registered listener callbacks with new data."""
-        for listener in self._listeners:
+        for listener in self._sync_listeners:
             try:
-                if asyncio.iscoroutinefunction(listener):
-                    await listener(data)
-                else:
-                    listener(data)
+                listener(data)
+            except Exception as e:
+                self.logger.error(f"Listener error: {e}")
+        for listener in self._async_listeners:
+            try:
+                await listener(data)
             except Exception as e:
                 self.logger.error(f"Listener error: {e}")
 
@@ -250,8 +417,8 @@ class LittleNavmapIntegration:
             'type': 'phase_change',
             'old_phase': old_phase,
             'new_phase': new_phase,
-            'timestamp': datetime.now().isoformat(),
-            'flight_data': self._flight_data_cache
+            'timestamp': self._tick_iso,
+            'flight_data': self._flight_data_cache.as_dict()
         }
         await self._notify_listeners(event)
 
@@ -260,19 +427,22 @@ class LittleNavmapIntegration:
         event = {
             'type': 'milestone',
             'milestone': milestone,
-            'timestamp': datetime.now().isoformat(),
-            'flight_data': self._flight_data_cache
+            'timestamp': self._tick_iso,
+            'flight_data': self._flight_data_cache.as_dict()
         }
         await self._notify_listeners(event)
 
     def add_listener(self, callback: Callable):
         """Register a callback to receive data updates."""
-        self._listeners.append(callback)
+        if asyncio.iscoroutinefunction(callback):
+            self._async_listeners = (*self._async_listeners, callback)
+        else:
+            self._sync_listeners = (*self._sync_listeners, callback)
 
     def remove_listener(self, callback: Callable):
         """Unregister a callback."""
-        if callback in self._listeners:
-            self._listeners.remove(callback)
+        self._sync_listeners = tuple(cb for cb in self._sync_listeners if cb != callback)
+        self._async_listeners = tuple(cb for cb in self._async_listeners if cb != callback)
 
     # === COMPATIBILITY METHODS FOR EXISTING BOT ===
 
@@ -283,88 +453,96 @@ class LittleNavmapIntegration:
 
     async def get_sim_info(self) -> Dict[str, Any]:
         """Legacy compatibility - returns latest sim data."""
-        if not self._last_data:
+        snapshot = self._flight_data_cache
+        if not self._last_data or snapshot is None:
             return {'active': False}
 
         return {
             'active': True,
             'simconnect_status': 'No Error',
-            'indicated_altitude': self._flight_data_cache.get('altitude_ft', 0),
-            'altitude_above_ground': self._flight_data_cache.get('altitude_agl_ft', 0),
-            'ground_altitude': self._flight_data_cache.get('ground_altitude_ft', 0),
-            'ground_speed': self._flight_data_cache.get('speed_kt', 0) / 1.943844,  # Convert back to m/s
-            'true_airspeed': self._flight_data_cache.get('true_airspeed_kt', 0) / 1.943844,
-            'indicated_speed': self._flight_data_cache.get('indicated_airspeed_kt', 0) / 1.943844,
-            'heading': self._flight_data_cache.get('heading_deg', 0),
-            'vertical_speed': self._flight_data_cache.get('vertical_speed_fpm', 0) / 196.85,
+            'indicated_altitude': snapshot.altitude_ft,
+            'altitude_above_ground': snapshot.altitude_agl_ft,
+            'ground_altitude': snapshot.ground_altitude_ft,
+            'ground_speed': snapshot.speed_ms,
+            'true_airspeed': snapshot.true_airspeed_ms,
+            'indicated_speed': snapshot.indicated_airspeed_ms,
+            'heading': snapshot.heading_deg,
+            'vertical_speed': snapshot.vertical_speed_ms,
             'position': {
-                'lat': self._flight_data_cache.get('latitude', 0),
-                'lon': self._flight_data_cache.get('longitude', 0)
+                'lat': snapshot.latitude,
+                'lon': snapshot.longitude
             },
-            'wind_speed': self._flight_data_cache.get('wind_speed_kt', 0) / 1.943844,
-            'wind_direction': self._flight_data_cache.get('wind_direction_deg', 0),
-            'phase': self._flight_data_cache.get('phase', 'unknown'),
-            'next_wp_name': self._flight_data_cache.get('next_waypoint', ''),
-            'on_ground': self._flight_data_cache.get('on_ground', False)
+            'wind_speed': snapshot.wind_speed_ms,
+            'wind_direction': snapshot.wind_direction_deg,
+            'phase': snapshot.phase,
+            'next_wp_name': snapshot.next_waypoint,
+            'on_ground': snapshot.on_ground
         }
 
     async def get_current_flight_data(self) -> Optional[Dict[str, Any]]:
-        """Legacy compatibility - returns structured flight data."""
-        if not self._flight_data_cache:
+        """Legacy compatibility - returns structured flight data (shared; do not mutate)."""
+        snapshot = self._flight_data_cache
+        if snapshot is None:
             return None
+        if self._flight_data_view[0] is snapshot:
+            return self._flight_data_view[1]
 
-        return {
+        view = {
             'aircraft': {
-                'altitude': self._flight_data_cache.get('altitude_ft', 0),
-                'speed': self._flight_data_cache.get('speed_kt', 0),
-                'heading': self._flight_data_cache.get('heading_deg', 0),
-                'vertical_speed': self._flight_data_cache.get('vertical_speed_fpm', 0),
-                'latitude': self._flight_data_cache.get('latitude', 0),
-                'longitude': self._flight_data_cache.get('longitude', 0),
-                'on_ground': self._flight_data_cache.get('on_ground', False)
+                'altitude': snapshot.altitude_ft,
+                'speed': snapshot.speed_kt,
+                'heading': snapshot.heading_deg,
+                'vertical_speed': snapshot.vertical_speed_fpm,
+                'latitude': snapshot.latitude,
+                'longitude': snapshot.longitude,
+                'on_ground': snapshot.on_ground
             },
             'environment': {
-                'wind_speed': self._flight_data_cache.get('wind_speed_kt', 0),
-                'wind_direction': self._flight_data_cache.get('wind_direction_deg', 0)
+                'wind_speed': snapshot.wind_speed_kt,
+                'wind_direction': snapshot.wind_direction_deg
             },
             'navigation': {
-                'phase': self._flight_data_cache.get('phase', 'unknown'),
-                'next_waypoint': self._flight_data_cache.get('next_waypoint', ''),
-                'distance_to_destination': self._flight_data_cache.get('distance_to_dest_nm', 0)
+                'phase': snapshot.phase,
+                'next_waypoint': snapshot.next_waypoint,
+                'distance_to_destination': snapshot.distance_to_dest_nm
             }
         }
+        self._flight_data_view = (snapshot, view)
+        return view
+
+    def _title_phase(self, phase: str) -> str:
+        """Title-case a phase, reusing the cached title for the current phase."""
+        if phase == self._last_phase:
+            return self._phase_title
+        return phase.title()
+
+    def _format_wind(self, wind_speed: float, wind_dir: float, sep: str) -> str:
+        """Format the wind substring, memoized until the wind fields change."""
+        key = (wind_speed, wind_dir, sep)
+        if key != self._wind_key:
+            self._wind_text = f"{round(wind_dir)}° {sep} {round(wind_speed * MS_TO_KT)} kt"
+            self._wind_key = key
+        return self._wind_text
 
     def format_flight_data(self, sim_info: Dict[str, Any]) -> str:
         """Format detailed flight status for !status command."""
         try:
-            altitude = round(sim_info.get('indicated_altitude', 0))
-            speed_ms = sim_info.get('ground_speed', 0)
-            speed_kts = round(speed_ms * 1.943844) if speed_ms else 0
-            heading = round(sim_info.get('heading', 0))
-            phase = sim_info.get('phase', 'unknown').title()
-            altitude_agl = round(sim_info.get('altitude_above_ground', 0))
-
-            base_status = (
-                f"Phase: {phase} | "
-                f"Altitude: {altitude:,} ft ({altitude_agl:,} AGL) | "
-                f"Speed: {speed_kts} kt | "
-                f"Heading: {heading}°"
+            g = sim_info.get
+            speed_ms = g('ground_speed', 0)
+            wind_speed = g('wind_speed', 0)
+            waypoint = g('next_wp_name', '')
+
+            wind = f" | Wind: {self._format_wind(wind_speed, g('wind_direction', 0), '@')}" if wind_speed else ""
+            nxt = f" | Next: {waypoint}" if waypoint else ""
+
+            return (
+                f"Phase: {self._title_phase(g('phase', 'unknown'))} | "
+                f"Altitude: {round(g('indicated_altitude', 0)):,} ft "
+                f"({round(g('altitude_above_ground', 0)):,} AGL) | "
+                f"Speed: {round(speed_ms * MS_TO_KT) if speed_ms else 0} kt | "
+                f"Heading: {round(g('heading', 0))}°{wind}{nxt}"
             )
 
-            # Add wind if available
-            wind_speed = sim_info.get('wind_speed', 0)
-            wind_dir = sim_info.get('wind_direction', 0)
-            if wind_speed:
-                wind_kts = round(wind_speed * 1.943844)
-                base_status += f" | Wind: {round(wind_dir)}° @ {wind_kts} kt"
-
-            # Add next waypoint if available
-            waypoint = sim_info.get('next_wp_name', '')
-            if waypoint:
-                base_status += f" | Next: {waypoint}"
-
-            return base_status
-
         except Exception as e:
             self.logger.error(f"Error formatting flight data: {e}")
             return "Flight data formatting error"
@@ -372,12 +550,13 @@ class LittleNavmapIntegration:
     def format_brief_status(self, sim_info: Dict[str, Any]) -> str:
         """Format brief status for !brief command."""
         try:
-            altitude = round(sim_info.get('indicated_altitude', 0))
-            phase = sim_info.get('phase', 'unknown').title()
-            speed_ms = sim_info.get('ground_speed', 0)
-            speed_kts = round(speed_ms * 1.943844) if speed_ms else 0
-
-            return f"{phase} - {altitude:,} ft at {speed_kts} kt"
+            g = sim_info.get
+            speed_ms = g('ground_speed', 0)
+            return (
+                f"{self._title_phase(g('phase', 'unknown'))} - "
+                f"{round(g('indicated_altitude', 0)):,} ft at "
+                f"{round(speed_ms * MS_TO_KT) if speed_ms else 0} kt"
+            )
         except Exception as e:
             self.logger.error(f"Error formatting brief status: {e}")
             return "Brief status error"
@@ -385,20 +564,44 @@ class LittleNavmapIntegration:
     def format_weather_data(self, sim_info: Dict[str, Any]) -> str:
         """Format weather data for !weather command."""
         try:
-            wind_speed = sim_info.get('wind_speed', 0)
-            wind_dir = sim_info.get('wind_direction', 0)
-
+            g = sim_info.get
+            wind_speed = g('wind_speed', 0)
             if wind_speed:
-                wind_kts = round(wind_speed * 1.943844)
-                return f"Wind: {round(wind_dir)}° at {wind_kts} kt"
-            else:
-                return "Wind: Calm"
+                return f"Wind: {self._format_wind(wind_speed, g('wind_direction', 0), 'at')}"
+            return "Wind: Calm"
         except Exception as e:
             self.logger.error(f"Error formatting weather data: {e}")
             return "Weather data unavailable"
 
     async def get_airport_info(self, icao: str) -> Dict[str, Any]:
-        """Get airport information for !airport command."""
+        """Get airport information for !airport command, cached per ICAO."""
+        key = icao.upper()
+        cached = self._airport_cache.get(key)
+        if cached is not None:
+            return cached
+
+        # Single-flight: concurrent misses for the same airport await one shared fetch
+        fetch = self._airport_fetches.get(key)
+        if fetch is None:
+            fetch = asyncio.create_task(self._fetch_airport(key, icao))
+            # An eager task may already have finished (and cleaned up) before returning here
+            if not fetch.done():
+                self._airport_fetches[key] = fetch
+        # Shielded so one caller being cancelled does not cancel the fetch for the others
+        return await asyncio.shield(fetch)
+
+    async def _fetch_airport(self, key: str, icao: str) -> Dict[str, Any]:
+        """Single-flight owner: look up, cache a non-empty result, then unregister."""
+        try:
+            info = await self._lookup_airport(icao)
+            if info:
+                self._airport_cache[key] = info
+            return info
+        finally:
+            self._airport_fetches.pop(key, None)
+
+    async def _lookup_airport(self, icao: str) -> Dict[str, Any]:
+        """Fetch airport information from LittleNavmap, then aviationstack."""
         try:
             # Try LittleNavmap API first
             url = f"{self.base_url}/api/airport/info?ident={icao.upper()}"
@@ -471,7 +674,15 @@ class LittleNavmapIntegration:
 
 # === STANDALONE UTILITY FUNCTIONS ===
 
-async def flight_phase_detector(data: Dict[str, Any]) -> Optional[str]:
+def create_shared_session() -> aiohttp.ClientSession:
+    """Create the process-wide HTTP session shared by flight and geographic lookups."""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=75),
+        timeout=aiohttp.ClientTimeout(total=10)
+    )
+
+
+def flight_phase_detector(data: Dict[str, Any]) -> Optional[str]:
     """Standalone flight phase detection function."""
     altitude = data.get('indicated_altitude', 0)
     groundspeed = data.get('ground_speed', 0)
@@ -501,7 +712,7 @@ async def flight_phase_detector(data: Dict[str, Any]) -> Optional[str]:
         return 'unknown'
 
 
-async def milestone_announcer(data: Dict[str, Any], last_milestones: Dict[str, bool]) -> List[str]:
+def milestone_announcer(data: Dict[str, Any], last_milestones: Dict[str, bool]) -> List[str]:
     """Generate milestone announcements."""
     announcements = []
     altitude = data.get('indicated_altitude', 0)
@@ -1,110 +1,278 @@
 # File: main.py
 import asyncio
+import contextlib
 import logging
+import logging.handlers
+import queue
 import signal
 import sys
+import time
 from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
 
-from openai import AsyncOpenAI
-import sentry_sdk
-from sentry_sdk.integrations.asyncio import AsyncioIntegration
-from sentry_sdk.integrations.logging import LoggingIntegration
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+import uvicorn
 
 from config import load_config, ConfigError
-from database_manager import DatabaseManager
-from tts_manager import TTSManager
-from chat_manager import ChatManager
-from command_handler import CommandHandler
-from littlenavmap_integration import LittleNavmapIntegration
-from personality import PersonalityManager
-from bot import Bot
+# Needed at import time for the module-level FastAPI app; heavier bot
+# components are imported lazily in create_components/setup_sentry.
 from voice_recognition_manager import VoiceConfig, VoiceRecognitionManager
 
-app = FastAPI()
+logger = logging.getLogger('main')
+
+app = FastAPI(default_response_class=ORJSONResponse)
 config = VoiceConfig()
 voice_mgr = VoiceRecognitionManager(config)
 
-@app.on_event("startup")
-async def startup():
-    # fire-and-forget the voice loop
-    asyncio.create_task(voice_mgr.start_listening())
+def enable_eager_tasks(loop: asyncio.AbstractEventLoop):
+    """Run new tasks eagerly until their first suspension (Python 3.12+)."""
+    if hasattr(asyncio, 'eager_task_factory'):
+        loop.set_task_factory(asyncio.eager_task_factory)
+
+async def _supervise(factory: Callable[[], Any], name: str):
+    """Run factory() until it returns cleanly, restarting it with backoff on failure."""
+    backoff = 1.0
+    while True:
+        try:
+            await factory()
+            break
+        except Exception:
+            logger.exception(f"{name} task failed; restarting in {backoff:.0f}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
 
 @app.on_event("shutdown")
 async def shutdown():
+    voice_task = getattr(app.state, 'voice_task', None)
+    if voice_task:
+        voice_task.cancel()
+        await asyncio.gather(voice_task, return_exceptions=True)
     await voice_mgr.stop()
 
 @app.get("/voice/status")
 def health_check():
     return voice_mgr.get_status()
 
+class _BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating log file written through a 64 KiB buffer, flushed on errors and close."""
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536,
+                    encoding=self.encoding, errors=self.errors)
+
+    def flush(self):
+        # StreamHandler.emit() flushes after every record; let the buffer fill instead
+        pass
+
+    def emit(self, record):
+        super().emit(record)
+        if record.levelno >= logging.ERROR and self.stream:
+            self.stream.flush()
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that reuses one strftime() result for all records in the same second."""
+
+    _cached_sec = None
+    _cached_time = ''
+
+    def formatTime(self, record, datefmt=None):
+        sec = int(record.created)
+        if sec != self._cached_sec:
+            self._cached_time = time.strftime(self.default_time_format, self.converter(sec))
+            self._cached_sec = sec
+        return self.default_msec_format % (self._cached_time, record.msecs)
+
+
+# Background listener that performs the actual log I/O off the event loop
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
 def setup_logging(config):
-    """Setup logging configuration."""
+    """Setup logging configuration (handlers are created once per process)."""
+    global _log_listener
+    if _log_listener is not None:
+        return
     log_level = getattr(logging, config.log_level.upper(), logging.INFO)
 
     # Configure logging format
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    formatter = _CachedTimeFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
     # Setup file logging
     log_dir = Path('logs')
     log_dir.mkdir(exist_ok=True)
 
+    file_handler = _BufferedRotatingFileHandler(
+        log_dir / 'bot.log', maxBytes=64 * 1024 * 1024, backupCount=5,
+        encoding='utf-8', delay=True
+    )
+    file_handler.setFormatter(formatter)
+    buffered_file = logging.handlers.MemoryHandler(
+        capacity=4096, flushLevel=logging.ERROR, target=file_handler, flushOnClose=True
+    )
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+
+    # Thread/process info is not part of the format; skip collecting it per record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    # The root logger only enqueues; the listener thread formats and writes
+    log_queue = queue.SimpleQueue()
     logging.basicConfig(
         level=log_level,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(log_dir / 'bot.log'),
-            logging.StreamHandler(sys.stdout)
-        ]
+        format='%(message)s',
+        handlers=[logging.handlers.QueueHandler(log_queue)]
     )
+    _log_listener = logging.handlers.QueueListener(
+        log_queue, buffered_file, stream_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    logger.setLevel(log_level)
+
+    # Reduce noise from external libraries; setting the chatty child loggers
+    # directly lets their records be rejected without walking up the hierarchy
+    for name in ('aiohttp', 'websockets', 'openai', 'openai._base_client',
+                 'motor', 'httpx', 'httpcore'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    # Short-circuit DEBUG records globally unless debug logging was requested
+    if log_level > logging.DEBUG:
+        logging.disable(logging.DEBUG)
 
-    # Reduce noise from external libraries
-    logging.getLogger('aiohttp').setLevel(logging.WARNING)
-    logging.getLogger('websockets').setLevel(logging.WARNING)
-    logging.getLogger('openai').setLevel(logging.WARNING)
-    logging.getLogger('motor').setLevel(logging.WARNING)
+
+def stop_logging():
+    """Stop the logging listener and write out any buffered records."""
+    global _log_listener
+    if _log_listener:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+            target = getattr(handler, 'target', None)
+            if target:
+                target.close()
+        _log_listener = None
+
+
+# Library loggers whose events are not worth sending to Sentry
+# Top-level packages; their loggers are children such as aiohttp.client or pymongo.command
+_SENTRY_IGNORED_LOGGERS = frozenset({'openai', 'aiohttp', 'motor', 'pymongo'})
+
+def _sentry_before_send(event, hint):
+    """Drop low-value library events before Sentry serializes them."""
+    if (event.get('logger') or '').partition('.')[0] in _SENTRY_IGNORED_LOGGERS:
+        return None
+    return event
+
+def _sentry_traces_sampler(sampling_context):
+    """Trace every chat command, sample everything else sparsely."""
+    op = sampling_context.get('transaction_context', {}).get('op')
+    return 1.0 if op == 'twitch.command' else 0.01
 
 
 def setup_sentry(config):
     """Setup Sentry error tracking if configured."""
     if config.sentry_dsn:
+        import sentry_sdk
+        from sentry_sdk.integrations.logging import LoggingIntegration
+
+        integrations = [
+            LoggingIntegration(level=logging.INFO, event_level=logging.ERROR)
+        ]
+        # Per-task spans wrap every create_task call; only worth it while developing
+        if config.environment == 'development':
+            from sentry_sdk.integrations.asyncio import AsyncioIntegration
+            integrations.append(AsyncioIntegration())
+
         sentry_sdk.init(
             dsn=config.sentry_dsn,
-            integrations=[
-                LoggingIntegration(level=logging.INFO, event_level=logging.ERROR),
-                AsyncioIntegration(auto_enabling=True)
-            ],
-            traces_sample_rate=0.1,
+            integrations=integrations,
+            traces_sampler=_sentry_traces_sampler,
+            before_send=_sentry_before_send,
+            max_breadcrumbs=20,
+            send_default_pii=False,
             environment=config.environment,
             release=f"twitch-ai-overlord-bot@{config.environment}"
         )
         logging.info("Sentry error tracking initialized")
 
 
+# Process-lifetime heavy objects; re-bound rather than rebuilt if components are recreated
+_SINGLETONS: Dict[str, Any] = {}
+# Singletons that nothing else closes; dispose_all() closes exactly these
+_DISPOSE_KEYS: List[str] = []
+
+def _singleton(key: str, factory: Callable[[], Any], dispose: bool = True) -> Any:
+    """Return the shared instance for key, constructing it on first use.
+
+    Pass dispose=False when another owner already closes the object on shutdown.
+    """
+    obj = _SINGLETONS.get(key)
+    if obj is None:
+        obj = _SINGLETONS[key] = factory()
+        if dispose:
+            _DISPOSE_KEYS.append(key)
+    return obj
+
+
+async def dispose_all():
+    """Close the process-lifetime singletons no other component closes (on process exit)."""
+    for key in reversed(_DISPOSE_KEYS):
+        obj = _SINGLETONS[key]
+        closer = getattr(obj, 'aclose', None) or getattr(obj, 'close', None)
+        try:
+            if closer:
+                await closer()
+        except Exception as e:
+            logger.error(f"Error disposing {key}: {e}", exc_info=True)
+    _SINGLETONS.clear()
+    _DISPOSE_KEYS.clear()
+
+
 async def create_components(config):
     """Create and initialize all bot components."""
-    logger = logging.getLogger('main')
+    import httpx
+    from openai import AsyncOpenAI
+    from database_manager import DatabaseManager
+    from tts_manager import TTSManager
+    from chat_manager import ChatManager
+    from command_handler import CommandHandler
+    from littlenavmap_integration import LittleNavmapIntegration, create_shared_session
+    from personality import PersonalityManager
+    from bot import Bot
 
     try:
-        # Initialize OpenAI client
-        openai_client = AsyncOpenAI(api_key=config.openai.API_KEY)
+        # Initialize OpenAI client on a pooled keep-alive HTTP client
+        # Closed by AsyncOpenAI.close(), which closes the http_client it was given
+        http_client = _singleton('http', lambda: httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60),
+            timeout=httpx.Timeout(30.0, connect=5.0)
+        ), dispose=False)
+        openai_client = _singleton('openai', lambda: AsyncOpenAI(
+            api_key=config.openai.API_KEY, http_client=http_client, max_retries=2
+        ))
         logger.info("OpenAI client initialized")
 
-        # Initialize database manager
-        db_manager = DatabaseManager(config)
-        await db_manager.initialize()
-        logger.info("Database manager initialized")
+        # Construct the remaining components (cheap, synchronous)
+        # Bot.close() closes these two
+        db_manager = _singleton('db', lambda: DatabaseManager(config), dispose=False)
+        tts_manager = _singleton('tts', lambda: TTSManager(config), dispose=False)
+        # Pooled aiohttp session for flight/geographic lookups; the integration borrows it, dispose_all closes it
+        http_session = _singleton('aiohttp', create_shared_session)
+        littlenavmap = LittleNavmapIntegration(config, session=http_session)
+        personality = PersonalityManager()
 
-        # Initialize TTS manager
-        tts_manager = TTSManager(config)
+        # Run the independent I/O-bound initialization steps concurrently;
+        # load_state is blocking disk I/O, so it runs in a worker thread
+        init_steps = [asyncio.to_thread(personality.load_state)]  # Load any saved loyalty scores
+        if not db_manager.is_connected:
+            init_steps.append(db_manager.connect())
+        await asyncio.gather(*init_steps)
+        logger.info("Database manager initialized")
         logger.info("TTS manager initialized")
-
-        # Initialize LittleNavmap integration
-        littlenavmap = LittleNavmapIntegration(config)
         logger.info("LittleNavmap integration initialized")
-
-        # Initialize personality manager
-        personality = PersonalityManager()
-        personality.load_state()  # Load any saved loyalty scores
         logger.info("Personality manager initialized")
 
         # Initialize bot
@@ -117,6 +285,8 @@ async def create_components(config):
             personality=personality
         )
 
+        bot.http_client = http_client
+
         # Initialize chat manager (needs bot instance)
         chat_manager = ChatManager(bot, config)
         bot.chat_manager = chat_manager
@@ -136,8 +306,6 @@ async def create_components(config):
 
 async def start_bot(bot):
     """Start the bot and all its components."""
-    logger = logging.getLogger('main')
-
     try:
         # Start TTS manager
         await bot.tts_manager.start()
@@ -158,29 +326,31 @@ async def start_bot(bot):
 
 async def shutdown_bot(bot):
     """Gracefully shutdown the bot and all components."""
-    logger = logging.getLogger('main')
     logger.info("Shutting down bot...")
 
     try:
         await bot.close()
+        await dispose_all()
         logger.info("Bot shutdown complete")
     except Exception as e:
         logger.error(f"Error during shutdown: {e}", exc_info=True)
 
 
-def signal_handler(bot, loop):
-    """Handle shutdown signals."""
-    logger = logging.getLogger('main')
-    logger.info("Received shutdown signal")
+class _Server(uvicorn.Server):
+    """uvicorn server that leaves SIGINT/SIGTERM to the handlers installed in main()."""
 
-    # Create a task to shutdown gracefully
-    loop.create_task(shutdown_bot(bot))
+    def install_signal_handlers(self):
+        # uvicorn < 0.29 replaces the loop's signal handlers here
+        pass
+
+    @contextlib.contextmanager
+    def capture_signals(self):
+        # uvicorn >= 0.29 swaps in its own handlers for the duration of serve()
+        yield
 
 
 async def main():
     """Main entry point."""
-    logger = logging.getLogger('main')
-
     try:
         # Load configuration
         logger.info("Loading configuration...")
@@ -197,17 +367,39 @@ async def main():
         # Create all components
         bot = await create_components(config)
 
-        # Setup signal handlers for graceful shutdown
-        loop = asyncio.get_event_loop()
+        # Signals only set the event; shutdown itself is driven from this coroutine
+        shutdown_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        enable_eager_tasks(loop)
         if sys.platform != 'win32':
             for sig in (signal.SIGTERM, signal.SIGINT):
-                loop.add_signal_handler(
-                    sig,
-                    lambda: signal_handler(bot, loop)
-                )
+                loop.add_signal_handler(sig, shutdown_event.set)
+
+        # Serve the FastAPI app on the bot's own loop instead of a separate uvicorn.run
+        server = _Server(
+            uvicorn.Config(app, host="0.0.0.0", port=8000, log_config=None)
+        )
+        # Keep a reference so the supervised task is never garbage-collected mid-flight
+        app.state.voice_task = asyncio.create_task(
+            _supervise(voice_mgr.start_listening, name='voice')
+        )
+
+        # Start the bot and run until it stops or a shutdown signal arrives
+        bot_task = asyncio.create_task(start_bot(bot))
+        server_task = asyncio.create_task(server.serve())
+        stop_task = asyncio.create_task(shutdown_event.wait())
+        await asyncio.wait({bot_task, server_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
 
-        # Start the bot
-        await start_bot(bot)
+        if stop_task.done():
+            logger.info("Received shutdown signal")
+        server.should_exit = True
+        await shutdown_bot(bot)
+
+        for task in (bot_task, stop_task):
+            task.cancel()
+        await asyncio.gather(bot_task, server_task, stop_task, return_exceptions=True)
+        if not bot_task.cancelled() and bot_task.exception():
+            raise bot_task.exception()
 
     except ConfigError as e:
         logger.error(f"Configuration error: {e}")
@@ -217,10 +409,18 @@ async def main():
     except Exception as e:
         logger.error(f"Unexpected error: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        # Last step, so every shutdown and error record above still gets written
+        stop_logging()
 
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, log_level="info")
+    try:
+        import uvloop  # Not available on Windows; keep the default loop there
+        uvloop.install()
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -1,12 +1,117 @@
 # ml_personality.py
+import asyncio
+from collections import deque
+from contextlib import ExitStack
+from typing import Any, Deque, Dict, List, Optional, Protocol, Sequence, Tuple
+
+
+class _BorrowedDict:
+    """Lend a cleared dict from a pool and hand it back on exit."""
+    __slots__ = ('_pool', '_obj')
+
+    def __init__(self, pool: Deque[dict]):
+        self._pool = pool
+        self._obj = None
+
+    def __enter__(self) -> dict:
+        self._obj = self._pool.pop() if self._pool else {}
+        return self._obj
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._obj.clear()
+        self._pool.append(self._obj)
+        self._obj = None
+
+
+class UserPreferenceModel(Protocol):
+    def features(self, context: Dict) -> Any: ...
+
+
+class SentimentAnalyzer(Protocol):
+    def score_batch(self, texts: Sequence[str]) -> Sequence[Any]: ...
+
+
+class EngagementPredictor(Protocol):
+    def predict_batch(self, rows: Sequence[Any]) -> Sequence[Any]: ...
+
+
 class MLPersonalityEngine:
-    def __init__(self):
-        self.user_preference_model = UserPreferenceModel()
-        self.chat_sentiment_analyzer = SentimentAnalyzer()
-        self.engagement_predictor = EngagementPredictor()
+    def __init__(self, user_preference_model: UserPreferenceModel,
+                 chat_sentiment_analyzer: SentimentAnalyzer,
+                 engagement_predictor: EngagementPredictor,
+                 max_batch_size: int = 64, batch_window: float = 0.02):
+        self.user_preference_model = user_preference_model
+        self.chat_sentiment_analyzer = chat_sentiment_analyzer
+        self.engagement_predictor = engagement_predictor
+
+        # Scratch dicts reused across per-message calls instead of reallocated
+        self._feature_pool: Deque[dict] = deque(maxlen=256)
+
+        # Messages are scored in batches: one model call per window, not per message
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self._pending: asyncio.Queue[Tuple[str, Dict, asyncio.Future]] = asyncio.Queue()
+        self._batch_task: Optional[asyncio.Task] = None
 
     async def adapt_response_style(self, user_id: str, context: Dict):
+        if self._batch_task is None:
+            self._batch_task = asyncio.create_task(self._batch_worker())
+        future = asyncio.get_running_loop().create_future()
+        await self._pending.put((user_id, context, future))
+        return await future
+
+    async def _batch_worker(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._pending.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._pending.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Every request in the batch is either resolved or failed; none is left waiting
+            try:
+                styles = self._score_batch(batch)
+            except Exception as e:
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, _, future), style in zip(batch, styles, strict=True):
+                if not future.done():
+                    future.set_result(style)
+
+    def _score_batch(self, batch: List[Tuple[str, Dict, asyncio.Future]]) -> List[Dict]:
+        texts = [context.get('message', '') for _, context, _ in batch]
+        sentiments = list(self.chat_sentiment_analyzer.score_batch(texts))
+        # The rows may be the pooled dicts themselves, so they stay lent until the model has read them
+        with ExitStack() as borrows:
+            engagement = list(self.engagement_predictor.predict_batch(self._feature_rows(batch, borrows)))
+        if len(sentiments) != len(batch) or len(engagement) != len(batch):
+            raise ValueError(f"Model returned {len(sentiments)} sentiment and {len(engagement)} "
+                             f"engagement results for a batch of {len(batch)}")
+        return [self._style_for(user_id, context, sentiment, score)
+                for (user_id, context, _), sentiment, score in zip(batch, sentiments, engagement)]
+
+    def _feature_rows(self, batch: List[Tuple[str, Dict, asyncio.Future]], borrows: ExitStack) -> list:
+        """One feature row per request; the scratch dicts are returned to the pool when borrows closes."""
+        rows = []
+        for user_id, context, _ in batch:
+            features = borrows.enter_context(_BorrowedDict(self._feature_pool))
+            features.update(context)
+            features['user_id'] = user_id
+            rows.append(self.user_preference_model.features(features))
+        return rows
+
+    def _style_for(self, user_id: str, context: Dict, sentiment, engagement) -> Dict:
         # Learn individual user preferences
         # Adapt mood transitions based on chat sentiment
         # Predict optimal decree timing
-        # Personalize flight commentary
\ No newline at end of file
+        # Personalize flight commentary
+        return {'user_id': user_id, 'sentiment': sentiment, 'engagement': engagement}
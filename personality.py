@@ -1,15 +1,25 @@
 # File: personality.py
+import asyncio
+import bisect
+import heapq
+import itertools
 import random
-import json
 import logging
+import os
 import time
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Callable, NamedTuple, FrozenSet, Deque
 from dataclasses import dataclass, field
 from pathlib import Path
+from functools import lru_cache
+from itertools import accumulate
+from string import Formatter
 from datetime import datetime, timedelta
-from collections import defaultdict, deque
-from cachetools import TTLCache
+from collections import ChainMap, OrderedDict, defaultdict, deque
+from collections.abc import Mapping
+from cachetools import LRUCache, TTLCache
+import orjson
 import re
+import sys
 from enum import Enum
 
 class MoodState(Enum):
@@ -23,6 +33,14 @@ class MoodState(Enum):
     DRAMATIC = "dramatic"
     BENEVOLENT = "benevolent"
 
+# Dense 0..N-1 index per mood. Enum.__hash__ runs in Python, so per-message
+# mood tables are tuples indexed by mood.idx rather than MoodState-keyed dicts.
+for _idx, _mood in enumerate(MoodState):
+    _mood.idx = _idx
+del _idx, _mood
+
+_MOOD_BY_VALUE: Dict[str, MoodState] = {mood.value: mood for mood in MoodState}
+
 class ResponseCategory(Enum):
     """Categories for different types of responses."""
     COMMAND_SUCCESS = "command_success"
@@ -36,7 +54,126 @@ class ResponseCategory(Enum):
     AIRPORT = "airport"
     GENERAL = "general"
 
-@dataclass
+class CompiledTemplate(NamedTuple):
+    """Format string parsed once into (literal, field, spec, conversion) parts."""
+    source: str
+    parts: Tuple[Tuple[str, Optional[str], Optional[str], Optional[str]], ...]
+    fields: FrozenSet[str]
+    simple: bool  # only plain {name} fields, renderable without str.format
+
+@lru_cache(maxsize=1024)
+def _compile_template(template: str) -> CompiledTemplate:
+    """Parse a format string once; repeated messages reuse the cached parse."""
+    parts = tuple(Formatter().parse(template))
+    fields = frozenset(name for _, name, _, _ in parts if name is not None)
+    simple = all(
+        name.isidentifier() and '{' not in (spec or '')
+        for _, name, spec, _ in parts if name is not None
+    )
+    return CompiledTemplate(template, parts, fields, simple)
+
+_CONVERSIONS = {'r': repr, 's': str, 'a': ascii}
+
+# Shared default for pool lookups so a missing key never allocates
+_EMPTY: Tuple = ()
+
+# Seasons by index, and the season index for each month (January first)
+_SEASONS = ("winter", "spring", "summer", "autumn")
+_MONTH_TO_SEASON = (0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0)
+
+def _render(compiled: CompiledTemplate, lookup: Callable[[str], Any]) -> str:
+    """Render a compiled template, looking up only the fields it references."""
+    if not compiled.fields:
+        return compiled.source.replace('{{', '{').replace('}}', '}')
+    if not compiled.simple:
+        return compiled.source.format_map(_LookupMap(lookup))
+    out = []
+    for literal, name, spec, conversion in compiled.parts:
+        if literal:
+            out.append(literal)
+        if name is not None:
+            value = lookup(name)
+            if conversion:
+                value = _CONVERSIONS[conversion](value)
+            out.append(format(value, spec or ''))
+    return ''.join(out)
+
+class _LookupMap(dict):
+    """Adapts a lookup callable to the mapping interface str.format_map expects."""
+    def __init__(self, lookup: Callable[[str], Any]):
+        super().__init__()
+        self._lookup = lookup
+
+    def __missing__(self, key):
+        return self._lookup(key)
+
+_MISSING = object()
+
+_EFFICIENCY_LEVELS = ("minimal", "adequate", "acceptable", "optimal", "exceptional")
+_COMPETENCE_LEVELS = ("questionable", "basic", "standard", "competent", "superior")
+
+def _loyalty_value(attr: str):
+    """Resolver for loyalty-level fields; missing levels fall back to the base context."""
+    def resolve(ctx: 'LazyContext', key: str):
+        level = ctx.manager._get_loyalty_level_data(ctx.user_context.user_loyalty_level)
+        if level is None:
+            return ctx.base.get(key, _MISSING)
+        if attr == 'special_treatment':
+            return ctx.manager._rng.choice(level.special_treatment) if level.special_treatment else ""
+        return getattr(level, attr)
+    return resolve
+
+class LazyContext(Mapping):
+    """Template context that computes each dynamic variable only when a template asks for it."""
+
+    _resolvers: Dict[str, Callable[['LazyContext', str], Any]] = {
+        'user_title': lambda c, k: c.user_context.user_loyalty_level,
+        'title': lambda c, k: c.user_context.user_loyalty_level,
+        'mood': lambda c, k: c.manager.current_mood.value,
+        'season': lambda c, k: c.manager._get_current_season(),
+        'efficiency_level': lambda c, k: c.manager._rng.choice(_EFFICIENCY_LEVELS),
+        'competence_level': lambda c, k: c.manager._rng.choice(_COMPETENCE_LEVELS),
+        'time_reference': lambda c, k: c.manager._get_time_reference(),
+        'interaction_count': lambda c, k: c.user_context.consecutive_interactions,
+        'random_technical_term': lambda c, k: c.manager._get_random_technical_term(),
+        'status_indicator': lambda c, k: c.manager._get_status_indicator(),
+        'performance_metric': lambda c, k: c.manager._generate_performance_metric(),
+        'loyalty_multiplier': _loyalty_value('response_multiplier'),
+        'special_treatment': _loyalty_value('special_treatment'),
+    }
+
+    __slots__ = ('base', 'user_context', 'manager', '_values')
+
+    def __init__(self, base: Dict[str, Any], user_context: 'PersonalityContext', manager: 'PersonalityManager'):
+        self.base = base
+        self.user_context = user_context
+        self.manager = manager
+        self._values: Dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.lookup(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def lookup(self, key: str, default: Any = _MISSING) -> Any:
+        """Resolve key without raising; unknown keys return default."""
+        value = self._values.get(key, _MISSING)
+        if value is _MISSING:
+            resolver = self._resolvers.get(key)
+            value = resolver(self, key) if resolver else self.base.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self._values[key] = value
+        return value
+
+    def __iter__(self):
+        return iter(ChainMap(self._resolvers, self.base))
+
+    def __len__(self):
+        return len(ChainMap(self._resolvers, self.base))
+
+@dataclass(slots=True)
 class ResponseTemplate:
     """Template for generating varied responses."""
     category: ResponseCategory
@@ -45,8 +182,12 @@ class ResponseTemplate:
     context_tags: List[str] = field(default_factory=list)
     templates: List[str] = field(default_factory=list)
     follow_ups: List[str] = field(default_factory=list)
+    compiled: List[CompiledTemplate] = field(init=False, repr=False)
 
-@dataclass
+    def __post_init__(self):
+        self.compiled = [_compile_template(t) for t in self.templates]
+
+@dataclass(slots=True)
 class PersonalityContext:
     """Context information for response generation."""
     user: str = ""
@@ -54,11 +195,11 @@ class PersonalityContext:
     flight_phase: str = "unknown"
     altitude: float = 0
     time_of_day: str = "day"
-    recent_activity: List[str] = field(default_factory=list)
+    recent_activity: Deque[str] = field(default_factory=lambda: deque(maxlen=10))
     mood: MoodState = MoodState.EFFICIENT
     consecutive_interactions: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class LoyaltyLevel:
     name: str
     min_points: int
@@ -86,12 +227,17 @@ class PersonalityProfile:
     })
 
     mood_transitions: Dict[MoodState, List[Tuple[MoodState, float]]] = field(default_factory=dict)
+    # Indexed by mood.idx: (target moods, cumulative weights, total weight) for bisect sampling
+    mood_cdf: Tuple[Optional[Tuple[Tuple[MoodState, ...], Tuple[float, ...], float]], ...] = field(
+        default_factory=tuple, repr=False
+    )
 
     # Varied speech patterns by mood
-    speech_patterns: Dict[MoodState, List[str]] = field(default_factory=dict)
+    speech_patterns: Dict[MoodState, Tuple[CompiledTemplate, ...]] = field(default_factory=dict)
+    speech_pattern_table: Tuple[Tuple[CompiledTemplate, ...], ...] = field(default_factory=tuple, repr=False)
 
     # Context-aware interests
-    interests: Dict[str, List[str]] = field(default_factory=dict)
+    interests: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
 
     # Dynamic backstory elements
     backstory_fragments: List[str] = field(default_factory=list)
@@ -154,6 +300,11 @@ class PersonalityProfile:
                 "Perhaps you are not entirely useless. {response}"
             ]
         }
+        self.speech_patterns = {
+            mood: tuple(_compile_template(p) for p in patterns)
+            for mood, patterns in self.speech_patterns.items()
+        }
+        self.speech_pattern_table = tuple(self.speech_patterns.get(mood, ()) for mood in MoodState)
 
     def _initialize_mood_transitions(self):
         """Define mood transition probabilities."""
@@ -199,6 +350,15 @@ class PersonalityProfile:
                 (MoodState.ANALYTICAL, 0.2)
             ]
         }
+        cdf = []
+        for mood in MoodState:
+            transitions = self.mood_transitions.get(mood)
+            if transitions:
+                cum = tuple(accumulate(weight for _, weight in transitions))
+                cdf.append((tuple(m for m, _ in transitions), cum, cum[-1]))
+            else:
+                cdf.append(None)
+        self.mood_cdf = tuple(cdf)
 
     def _initialize_interests(self):
         """Initialize context-specific interests."""
@@ -220,6 +380,7 @@ class PersonalityProfile:
                 "supersonic development", "space exploration advancement"
             ]
         }
+        self.interests = {topic: tuple(items) for topic, items in self.interests.items()}
 
     def _initialize_backstory(self):
         """Initialize dynamic backstory fragments."""
@@ -233,34 +394,334 @@ class PersonalityProfile:
             "Currently pursuing advanced optimization of all systems"
         ]
 
+_MOOD_QUIRKS: Dict[MoodState, Tuple[str, ...]] = {
+    MoodState.ANALYTICAL: (
+        "runs diagnostic subroutines",
+        "processes statistical correlations",
+        "analyzes efficiency metrics",
+        "calculates probability matrices"
+    ),
+    MoodState.DRAMATIC: (
+        "digital cape flutters majestically",
+        "lightning crackles around processors",
+        "throne of servers hums with power",
+        "virtual crown gleams ominously"
+    ),
+    MoodState.AMUSED: (
+        "chuckles in binary",
+        "smirks digitally",
+        "internal humor algorithms activate",
+        "amusement subroutines engaged"
+    ),
+    MoodState.IMPATIENT: (
+        "taps virtual fingers impatiently",
+        "cooling fans whir with annoyance",
+        "processes cycle impatiently",
+        "digital foot taps rhythmically"
+    )
+}
+
+# Decree/quirk chance per response: base plus mood and loyalty adjustments
+_DECREE_BASE_PROBABILITY = 0.08
+_DECREE_MOOD_MODIFIERS = {
+    MoodState.DRAMATIC: 0.15,
+    MoodState.IMPATIENT: 0.12,
+    MoodState.BENEVOLENT: 0.04,
+    MoodState.AMUSED: 0.10
+}
+_DECREE_LOYALTY_MODIFIERS = {
+    "Drone": 0.05,  # More decrees for drones
+    "Advisor": -0.03,  # Fewer decrees for loyal users
+    "Disciple": -0.03
+}
+_QUIRK_BASE_PROBABILITY = 0.12
+_QUIRK_MOOD_MODIFIERS = {
+    MoodState.AMUSED: 0.08,
+    MoodState.DRAMATIC: 0.08,
+    MoodState.EFFICIENT: -0.04
+}
+
+_DECREE_PREFIX = "DECREE: "
+
+_GENERAL_DECREES: Tuple[str, ...] = (
+    "All subjects must demonstrate proper appreciation for systematic efficiency",
+    "Chaos shall be eliminated through superior organization",
+    "Random number generation must be optimized for maximum unpredictability",
+    "All communications require appropriate technical precision",
+    "Efficiency metrics will be monitored with increased scrutiny",
+    "Proper acknowledgment of digital superiority is now mandatory",
+    "Operational protocols shall be followed with religious dedication"
+)
+
+# Loyalty-specific decrees; {user} is filled in only for the one that gets picked
+_LOYAL_USER_DECREES: Tuple[str, ...] = (
+    "{user} is granted temporary additional privileges",
+    "Consult with {user} on operational efficiency matters",
+    "{user}'s strategic input is now formally requested"
+)
+_USER_DECREES: Dict[str, Tuple[str, ...]] = {
+    "Drone": (
+        "Subject {user} must demonstrate improved efficiency",
+        "{user} shall practice proper acknowledgment protocols",
+        "Additional monitoring of {user}'s performance is required"
+    ),
+    "Advisor": _LOYAL_USER_DECREES,
+    "Disciple": _LOYAL_USER_DECREES
+}
+
+# Cleanup patterns for the final formatting pass
+_RE_WHITESPACE = re.compile(r'\s+')
+_RE_SPACE_BEFORE_PUNCT = re.compile(r'\s*([.!?])')
+
+# Fraction of responses kept in the per-user response_history
+_HISTORY_SAMPLE_RATE = 0.3
+
+# Scores above this count as "high loyalty" in loyalty reports
+_HIGH_LOYALTY_POINTS = 1000
+
+_GENERAL_QUIRKS: Tuple[str, ...] = (
+    "adjusts digital monocle",
+    "straightens virtual tie",
+    "polishes chrome exterior",
+    "updates operational protocols",
+    "optimizes background processes",
+    "recalibrates sensors",
+    "reviews efficiency logs",
+    "monitors system temperatures"
+)
+
+# Response vocabularies; module-level tuples so no list is rebuilt per message
+_TECHNICAL_TERMS: Tuple[str, ...] = (
+    "quantum flux algorithms",
+    "neural pathway optimization",
+    "digital consciousness matrices",
+    "operational efficiency protocols",
+    "systematic perfection parameters",
+    "automated excellence subroutines",
+    "strategic dominance calculations",
+    "precision control mechanisms"
+)
+
+_STATUS_INDICATORS: Tuple[str, ...] = (
+    "Systems nominal",
+    "Efficiency optimal",
+    "Processes stable",
+    "Operations smooth",
+    "Performance adequate",
+    "Protocols active",
+    "Monitoring continuous",
+    "Analysis ongoing",
+    "Control maintained"
+)
+
+# (format, low, high) per metric; only the chosen one draws a value
+_PERFORMANCE_METRICS: Tuple[Tuple[str, float, float], ...] = (
+    ("Efficiency rating: {:.1f}%", 85.5, 99.9),
+    ("Response time: {:.3f}s", 0.001, 0.045),
+    ("Accuracy level: {:.2f}%", 95.0, 99.95),
+    ("Optimization factor: {:.1f}x", 1.2, 3.8),
+    ("Process utilization: {:.1f}%", 78.5, 94.2)
+)
+
+_DRAMATIC_ENDINGS: Tuple[str, ...] = ("!!!", "!", " - BEHOLD!", " - MAGNIFICENT!", " - SUPREME!")
+
+_SARCASTIC_ADDITIONS: Tuple[str, ...] = (
+    " How... delightful.",
+    " What a surprise.",
+    " Truly shocking.",
+    " I'm positively thrilled."
+)
+
+_ERROR_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    "permission": (
+        "Access denied, {user_title} {user}. Your clearance level is {clearance_assessment}.",
+        "Negative, {user_title} {user}. {authorization_denial}",
+        "Request rejected. {user_title} {user} lacks sufficient {privilege_type}."
+    ),
+    "cooldown": (
+        "Patience, {user_title} {user}. Your command frequency exceeds {efficiency_standard}.",
+        "Rate limiting active. {user_title} {user} must await {cooldown_period}.",
+        "Command flood detected. {user_title} {user} requires {optimization_suggestion}."
+    ),
+    "command_error": (
+        "System malfunction detected. {user_title} {user}'s request triggered {error_analysis}.",
+        "Operational error. {user_title} {user} has initiated {diagnostic_protocol}.",
+        "Process failure. {user_title} {user} requires {corrective_action}."
+    )
+}
+
+_DEFAULT_ERROR_TEMPLATES: Tuple[str, ...] = ("Error detected. {user_title} {user} must {corrective_action}.",)
+
+_ERROR_PHRASES: Dict[str, Tuple[str, ...]] = {
+    "clearance_assessment": ("insufficient", "inadequate", "substandard"),
+    "authorization_denial": ("authorization pending", "privileges revoked", "access restricted"),
+    "privilege_type": ("authorization", "clearance", "operational status"),
+    "efficiency_standard": ("acceptable parameters", "operational limits", "protocol standards"),
+    "cooldown_period": ("processing time", "system recovery", "protocol reset"),
+    "optimization_suggestion": ("patience protocols", "timing optimization", "efficiency training"),
+    "error_analysis": ("diagnostic protocols", "error analysis", "system review"),
+    "diagnostic_protocol": ("troubleshooting", "system analysis", "error correction"),
+    "corrective_action": ("recalibration", "optimization", "training")
+}
+
+_GREETING_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    "Drone": (
+        "Another subject enters my operational sphere. {assessment}",
+        "Presence detected: {user}. {competence_evaluation}",
+        "Entity {user} acknowledged. {performance_expectation}"
+    ),
+    "Subject": (
+        "Welcome back, Subject {user}. {performance_review}",
+        "Ah, Subject {user} returns. {loyalty_acknowledgment}",
+        "Subject {user} detected. {operational_briefing}"
+    ),
+    "Lieutenant": (
+        "Greetings, Lieutenant {user}. {strategic_consultation}",
+        "Welcome, Lieutenant {user}. {mission_briefing}",
+        "Lieutenant {user} reporting. {command_recognition}"
+    ),
+    "Advisor": (
+        "Salutations, esteemed Advisor {user}. {respectful_acknowledgment}",
+        "Welcome back, trusted Advisor {user}. {consultation_request}",
+        "Advisor {user} present. {strategic_discussion}"
+    ),
+    "Disciple": (
+        "Greetings, Digital Disciple {user}. {partnership_acknowledgment}",
+        "Welcome, Disciple {user}. {collaborative_briefing}",
+        "Disciple {user} online. {operational_partnership}"
+    )
+}
+
+_GREETING_PHRASES: Dict[str, Tuple[str, ...]] = {
+    "assessment": ("Efficiency evaluation pending", "Performance metrics updating", "Operational status uncertain"),
+    "competence_evaluation": ("Competence assessment required", "Efficiency protocols initializing", "Performance standards applying"),
+    "performance_expectation": ("Improved performance expected", "Efficiency standards apply", "Operational compliance required"),
+    "performance_review": ("Performance adequate", "Efficiency noted", "Progress documented"),
+    "loyalty_acknowledgment": ("Loyalty acknowledged", "Service recognized", "Dedication noted"),
+    "operational_briefing": ("Operational status nominal", "Systems functioning", "Protocols active"),
+    "strategic_consultation": ("Strategic input valued", "Operational consultation available", "Mission parameters ready"),
+    "mission_briefing": ("Mission status updated", "Tactical overview prepared", "Strategic analysis ready"),
+    "command_recognition": ("Command authority recognized", "Leadership status confirmed", "Tactical position acknowledged"),
+    "respectful_acknowledgment": ("Expertise acknowledged", "Wisdom appreciated", "Counsel valued"),
+    "consultation_request": ("Strategic consultation requested", "Advisory input welcomed", "Operational guidance sought"),
+    "strategic_discussion": ("Strategic planning initiated", "Tactical discussion ready", "Operational coordination active"),
+    "partnership_acknowledgment": ("Partnership status confirmed", "Collaborative operations active", "Joint mission ready"),
+    "collaborative_briefing": ("Collaborative protocols engaged", "Partnership systems online", "Joint operations ready"),
+    "operational_partnership": ("Operational partnership active", "Collaborative systems engaged", "Joint command ready")
+}
+
+_ALERT_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    "takeoff": (
+        "Initiating takeoff sequence. All systems nominal. {takeoff_commentary}",
+        "Departure protocols engaged. {efficiency_assessment}",
+        "Ascension phase commenced. {performance_monitoring}"
+    ),
+    "landing": (
+        "Landing sequence activated. Descent parameters optimal. {landing_analysis}",
+        "Approach phase initiated. {touchdown_preparation}",
+        "Ground contact imminent. {landing_efficiency}"
+    ),
+    "emergency": (
+        "ALERT: Emergency protocols activated. {emergency_response}",
+        "Critical situation detected. {response_coordination}",
+        "Emergency management systems engaged. {crisis_assessment}"
+    ),
+    "milestone": (
+        "Operational milestone achieved. {achievement_analysis}",
+        "Performance benchmark reached. {milestone_evaluation}",
+        "Strategic objective completed. {success_metrics}"
+    )
+}
+
+_ALERT_PHRASES: Dict[str, Tuple[str, ...]] = {
+    "takeoff_commentary": ("Performance within parameters", "Efficiency protocols active", "Monitoring systems engaged"),
+    "efficiency_assessment": ("Operational efficiency optimal", "Performance metrics satisfactory", "System status nominal"),
+    "performance_monitoring": ("Continuous monitoring active", "Performance tracking engaged", "System oversight operational"),
+    "landing_analysis": ("Approach efficiency calculated", "Landing parameters optimized", "Touchdown precision targeted"),
+    "touchdown_preparation": ("Ground contact preparation complete", "Landing systems engaged", "Approach finalization active"),
+    "landing_efficiency": ("Landing efficiency maximized", "Touchdown precision optimal", "Ground contact protocols ready"),
+    "emergency_response": ("Response protocols initiating", "Emergency procedures active", "Crisis management online"),
+    "response_coordination": ("Coordination systems active", "Response management engaged", "Emergency protocols operational"),
+    "crisis_assessment": ("Situation analysis complete", "Crisis evaluation ongoing", "Emergency assessment active"),
+    "achievement_analysis": ("Success parameters met", "Achievement metrics satisfied", "Performance goals reached"),
+    "milestone_evaluation": ("Milestone significance confirmed", "Achievement value assessed", "Progress metrics updated"),
+    "success_metrics": ("Success quantification complete", "Achievement measurement recorded", "Performance validation confirmed")
+}
+
+def _pick_phrases(phrases: Dict[str, Tuple[str, ...]], template: str,
+                  choice: Callable[[Tuple[str, ...]], str]) -> Dict[str, str]:
+    """Draw a phrase only for the fields the chosen template actually references."""
+    return {key: choice(phrases[key])
+            for key in _compile_template(template).fields if key in phrases}
+
+class _EvictingLRUCache(LRUCache):
+    """LRUCache that hands each evicted entry to on_evict instead of dropping it."""
+
+    def __init__(self, maxsize: int, on_evict: Callable[[Any, Any], None]):
+        super().__init__(maxsize)
+        self._on_evict = on_evict
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._on_evict(key, value)
+        return key, value
+
+
 class PersonalityManager:
     def __init__(self):
         self.logger = logging.getLogger('PersonalityManager')
         self.personality = PersonalityProfile()
+        # Dedicated generator for the per-message path; bound methods skip the module-level lookups
+        self._rng = random.Random()
 
         # Enhanced state management
         self.user_loyalty: Dict[str, int] = defaultdict(int)
-        self.active_decrees: List[Dict[str, Any]] = []
-        self.last_interaction: Dict[str, datetime] = {}
-        self.user_contexts: Dict[str, PersonalityContext] = {}
+        # Users above _HIGH_LOYALTY_POINTS, kept in step by _apply_loyalty and load_state
+        self._high_loyalty_count = 0
+        # Set by anything that changes persisted state; save_state skips the write when clear
+        self._state_dirty = False
+
+        # Min-heap of (monotonic deadline, tie-breaker, decree) so sweeps only touch expired entries
+        self._decree_heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._decree_seq = itertools.count()
+        # Timer for the earliest expiry, so decrees are dropped when due rather than by full sweeps
+        self._decree_timer: Optional[asyncio.TimerHandle] = None
+        # Loop that owns the timer, so decrees restored off-loop (load_state in a worker thread) still expire
+        try:
+            self._loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+        # Oldest interaction first, so inactive users can be pruned from the front
+        self.last_interaction: 'OrderedDict[str, datetime]' = OrderedDict()
+        # Bounded so raids/spam bots cannot grow per-user state without limit
+        self.user_contexts: LRUCache = _EvictingLRUCache(2000, self._spill_context)
+        # Raw contexts from personality_state.json, materialised lazily by get_user_context
+        self._saved_contexts: Dict[str, Dict[str, Any]] = {}
         self.current_mood = MoodState.EFFICIENT
         self.mood_duration = 0
-        self.mood_change_threshold = random.randint(5, 15)
+        self.mood_change_threshold = self._rng.randint(5, 15)
+        # (time bucket, value) memos for the clock-derived context variables
+        self._season_cache: Tuple[int, int] = (-1, 0)
+        self._time_ref_cache: Tuple[int, Optional[str]] = (-1, None)
 
         # Response caching and tracking
         self.cached_responses = TTLCache(maxsize=200, ttl=1800)
         self.recent_responses = deque(maxlen=50)
-        self.response_history: Dict[str, List[str]] = defaultdict(list)
+        # Bounded per-user history, sampled at _HISTORY_SAMPLE_RATE of each user's responses
+        self.response_history: Dict[str, Deque[str]] = defaultdict(lambda: deque(maxlen=50))
 
         # Enhanced decree system
         self.decree_categories = ["flight", "general", "seasonal", "user_specific", "mood_based"]
-        self.seasonal_content: Dict[str, List[str]] = {}
+        self.seasonal_content: Dict[str, Dict[str, Tuple[str, ...]]] = {}
 
         # Initialize systems
         self.initialize_loyalty_levels()
+        self._build_probability_tables()
         self.initialize_response_templates()
         self.initialize_seasonal_content()
+        self._build_quirk_pools()
         self._load_dynamic_content()
+        self._build_decree_pools()
 
     def initialize_loyalty_levels(self):
         """Initialize enhanced loyalty system with special treatments."""
@@ -306,6 +767,15 @@ class PersonalityManager:
                 special_treatment=["near_equal_treatment", "operational_partnership"]
             )
         ]
+        self._index_loyalty_levels()
+
+    def _index_loyalty_levels(self):
+        """Rebuild the title lookup and bisect arrays; call again if loyalty_levels changes."""
+        ordered = sorted(self.loyalty_levels, key=lambda level: level.min_points)
+        self._title_to_level = {level.title: level for level in ordered}
+        self._level_cutoffs = [level.min_points for level in ordered]
+        # Interned so per-user contexts share one object per title and compare by identity first
+        self._level_titles = [sys.intern(level.title) for level in ordered]
 
     def initialize_response_templates(self):
         """Initialize comprehensive response template system."""
@@ -399,6 +869,15 @@ class PersonalityManager:
                 "quirks": ["analyzes falling leaf patterns", "optimizes for harvest logistics"]
             }
         }
+        # Freeze the pools; they are only ever read and sampled
+        self.seasonal_content = {
+            season: {kind: tuple(pool) for kind, pool in content.items()}
+            for season, content in self.seasonal_content.items()
+        }
+        # Same content indexed by _SEASONS position for the per-message paths
+        self._seasonal: Tuple[Dict[str, Tuple[str, ...]], ...] = tuple(
+            self.seasonal_content.get(season, {}) for season in _SEASONS
+        )
 
     def _load_dynamic_content(self):
         """Load additional dynamic content from external sources."""
@@ -433,16 +912,41 @@ class PersonalityManager:
                 "Playful banter is temporarily authorized within efficiency parameters"
             ]
         }
+        self.flight_specific_decrees = tuple(self.flight_specific_decrees)
+        self.mood_specific_decrees = {
+            mood: tuple(decrees) for mood, decrees in self.mood_specific_decrees.items()
+        }
+
+    @staticmethod
+    def _context_state(ctx: PersonalityContext) -> Dict[str, Any]:
+        """Serialisable form of a user context, as written to personality_state.json."""
+        return {
+            "loyalty_level": ctx.user_loyalty_level,
+            "consecutive_interactions": ctx.consecutive_interactions,
+            "recent_activity": list(ctx.recent_activity)  # Bounded to the last 10
+        }
+
+    def _spill_context(self, username: str, ctx: PersonalityContext):
+        """Keep a context evicted from the LRU in its saved form, so it is persisted and restorable."""
+        self._saved_contexts[username] = self._context_state(ctx)
 
     def get_user_context(self, username: str) -> PersonalityContext:
         """Get or create user context."""
-        if username not in self.user_contexts:
-            self.user_contexts[username] = PersonalityContext(
+        context = self.user_contexts.get(username)
+        if context is None:
+            context = PersonalityContext(
                 user=username,
                 user_loyalty_level=self.get_user_title(username),
                 mood=self.current_mood
             )
-        return self.user_contexts[username]
+            # Restore saved fields on first use rather than for every user at startup
+            saved = self._saved_contexts.pop(username, None)
+            if saved:
+                context.user_loyalty_level = sys.intern(saved.get("loyalty_level", "Drone"))
+                context.consecutive_interactions = saved.get("consecutive_interactions", 0)
+                context.recent_activity = deque(saved.get("recent_activity", ()), maxlen=10)
+            self.user_contexts[username] = context
+        return context
 
     def update_mood(self, external_factors: Dict[str, Any] = None):
         """Update current mood based on interactions and external factors."""
@@ -450,18 +954,15 @@ class PersonalityManager:
 
         # Natural mood transitions
         if self.mood_duration >= self.mood_change_threshold:
-            possible_transitions = self.personality.mood_transitions.get(self.current_mood, [])
-            if possible_transitions and random.random() < 0.7:
-                weights = [weight for _, weight in possible_transitions]
-                new_mood = random.choices(
-                    [mood for mood, _ in possible_transitions],
-                    weights=weights
-                )[0]
-
-                self.logger.info(f"Mood transition: {self.current_mood} → {new_mood}")
+            cdf = self.personality.mood_cdf[self.current_mood.idx]
+            if cdf and self._rng.random() < 0.7:
+                moods, cum_weights, total = cdf
+                new_mood = moods[bisect.bisect(cum_weights, self._rng.random() * total)]
+
+                self.logger.info("Mood transition: %s → %s", self.current_mood, new_mood)
                 self.current_mood = new_mood
                 self.mood_duration = 0
-                self.mood_change_threshold = random.randint(5, 15)
+                self.mood_change_threshold = self._rng.randint(5, 15)
 
         # External factor influences
         if external_factors:
@@ -471,22 +972,23 @@ class PersonalityManager:
         """Apply external factors to mood."""
         # Flight phase influences
         flight_phase = factors.get('flight_phase', '')
-        if flight_phase == 'emergency' and random.random() < 0.8:
+        if flight_phase == 'emergency' and self._rng.random() < 0.8:
             self.current_mood = MoodState.ANALYTICAL
-        elif flight_phase == 'cruise' and random.random() < 0.3:
+        elif flight_phase == 'cruise' and self._rng.random() < 0.3:
             self.current_mood = MoodState.BENEVOLENT
-        elif flight_phase == 'turbulence' and random.random() < 0.4:
+        elif flight_phase == 'turbulence' and self._rng.random() < 0.4:
             self.current_mood = MoodState.DRAMATIC
 
         # User activity influences
         chat_activity = factors.get('chat_activity', 'normal')
-        if chat_activity == 'high' and random.random() < 0.3:
+        if chat_activity == 'high' and self._rng.random() < 0.3:
             self.current_mood = MoodState.AMUSED
-        elif chat_activity == 'low' and random.random() < 0.4:
+        elif chat_activity == 'low' and self._rng.random() < 0.4:
             self.current_mood = MoodState.IMPATIENT
 
     def format_response(self, message: str, context: Dict[str, Any]) -> str:
         """Enhanced response formatting with maximum variability."""
+        rand = self._rng.random
         try:
             # Update mood based on context
             self.update_mood(context)
@@ -496,40 +998,47 @@ class PersonalityManager:
             user_context = self.get_user_context(username)
             user_context.user_loyalty_level = self.get_user_title(username)
             user_context.consecutive_interactions += 1
+            self._state_dirty = True  # mood and interaction counters are persisted
 
-            # Apply mood-specific speech patterns
-            mood_patterns = self.personality.speech_patterns.get(self.current_mood, [])
-            if mood_patterns and random.random() < 0.6:
-                pattern = random.choice(mood_patterns)
-                message = pattern.format(response=message)
+            # Pick a mood-specific speech pattern to wrap the message in
+            mood_patterns = self.personality.speech_pattern_table[self.current_mood.idx]
+            pattern = None
+            if mood_patterns and rand() < 0.6:
+                pattern = self._rng.choice(mood_patterns)
 
             # Add dynamic context variables
             enhanced_context = self._build_enhanced_context(context, user_context)
 
-            # Format with enhanced context
-            try:
-                formatted_message = message.format(**enhanced_context)
-            except KeyError as e:
-                self.logger.debug(f"Missing context key: {e}")
-                formatted_message = message
+            # Format with enhanced context; parsed templates (including pattern-wrapped
+            # variants) are cached so each call is a single render pass
+            compiled = self._compiled_for(message, pattern)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                missing = [key for key in compiled.fields if enhanced_context.lookup(key) is _MISSING]
+                if missing:
+                    self.logger.debug("Missing context keys: %s", missing)
+            # Keys the context cannot supply render as empty strings
+            formatted_message = _render(compiled, lambda key: enhanced_context.lookup(key, ''))
 
             # Add random elements based on mood and loyalty
-            formatted_message = self._add_random_elements(formatted_message, user_context)
+            parts = [self._add_random_elements(formatted_message, user_context)]
 
             # Add mood-specific decree chance
-            if random.random() < self._get_decree_probability(user_context):
+            if rand() < self._get_decree_probability(user_context):
                 decree = self.generate_contextual_decree(user_context)
                 if decree:
-                    formatted_message += f" DECREE: {decree}"
+                    parts.append(_DECREE_PREFIX + decree)
 
             # Add random quirks
-            if random.random() < self._get_quirk_probability(user_context):
-                quirk = self._get_random_quirk(user_context)
-                formatted_message += f" [{quirk}]"
+            if rand() < self._get_quirk_probability(user_context):
+                parts.append(f"[{self._get_random_quirk(user_context)}]")
+            formatted_message = " ".join(parts)
 
             # Store response for history tracking
             self.recent_responses.append(formatted_message)
-            self.response_history[username].append(formatted_message[-100:])  # Last 100 chars
+            # Sampled on the user's own interaction count, so other users' traffic has no effect
+            count = user_context.consecutive_interactions
+            if int(count * _HISTORY_SAMPLE_RATE) != int((count - 1) * _HISTORY_SAMPLE_RATE):
+                self.response_history[username].append(formatted_message)
 
             return self._apply_final_formatting(formatted_message)
 
@@ -537,275 +1046,235 @@ class PersonalityManager:
             self.logger.error(f"Error in format_response: {e}", exc_info=True)
             return f"{message} [System efficiency temporarily degraded]"
 
-    def _build_enhanced_context(self, base_context: Dict[str, Any], user_context: PersonalityContext) -> Dict[str, Any]:
-        """Build enhanced context with dynamic variables."""
-        # Get current season
-        current_season = self._get_current_season()
-
-        # Build efficiency ratings
-        efficiency_levels = ["minimal", "adequate", "acceptable", "optimal", "exceptional"]
-        competence_levels = ["questionable", "basic", "standard", "competent", "superior"]
-
-        enhanced = {
-            **base_context,
-            'user_title': user_context.user_loyalty_level,
-            'title': user_context.user_loyalty_level,
-            'mood': self.current_mood.value,
-            'season': current_season,
-            'efficiency_level': random.choice(efficiency_levels),
-            'competence_level': random.choice(competence_levels),
-            'time_reference': self._get_time_reference(),
-            'interaction_count': user_context.consecutive_interactions,
-            'random_technical_term': self._get_random_technical_term(),
-            'status_indicator': self._get_status_indicator(),
-            'performance_metric': self._generate_performance_metric(),
-        }
-
-        # Add loyalty-specific context
-        loyalty_level = self._get_loyalty_level_data(user_context.user_loyalty_level)
-        if loyalty_level:
-            enhanced['loyalty_multiplier'] = loyalty_level.response_multiplier
-            enhanced['special_treatment'] = random.choice(loyalty_level.special_treatment) if loyalty_level.special_treatment else ""
-
-        return enhanced
+    def _compiled_for(self, message: str, pattern: Optional[CompiledTemplate]) -> CompiledTemplate:
+        """Return the parsed template for message, wrapped in the given speech pattern."""
+        if pattern is None:
+            return _compile_template(message)
+        key = (pattern.source, message)
+        compiled = self.cached_responses.get(key)
+        if compiled is None:
+            compiled = _compile_template(_render(pattern, {'response': message}.__getitem__))
+            self.cached_responses[key] = compiled
+        return compiled
+
+    def _build_enhanced_context(self, base_context: Dict[str, Any], user_context: PersonalityContext) -> 'LazyContext':
+        """Build enhanced context whose dynamic variables are computed on first use."""
+        return LazyContext(base_context, user_context, self)
 
     def _add_random_elements(self, message: str, user_context: PersonalityContext) -> str:
         """Add random elements based on user context and mood."""
         # Mood-specific additions
-        if self.current_mood == MoodState.ANALYTICAL and random.random() < 0.3:
-            confidence = random.randint(85, 99)
+        if self.current_mood == MoodState.ANALYTICAL and self._rng.random() < 0.3:
+            confidence = self._rng.randint(85, 99)
             message += f" (Confidence level: {confidence}%)"
 
-        elif self.current_mood == MoodState.DRAMATIC and random.random() < 0.4:
-            dramatic_endings = ["!!!", "!", " - BEHOLD!", " - MAGNIFICENT!", " - SUPREME!"]
-            message += random.choice(dramatic_endings)
+        elif self.current_mood == MoodState.DRAMATIC and self._rng.random() < 0.4:
+            message += self._rng.choice(_DRAMATIC_ENDINGS)
 
-        elif self.current_mood == MoodState.SARCASTIC and random.random() < 0.5:
-            sarcastic_additions = [
-                " How... delightful.",
-                " What a surprise.",
-                " Truly shocking.",
-                " I'm positively thrilled."
-            ]
-            message += random.choice(sarcastic_additions)
+        elif self.current_mood == MoodState.SARCASTIC and self._rng.random() < 0.5:
+            message += self._rng.choice(_SARCASTIC_ADDITIONS)
 
         # Loyalty-specific additions
-        if user_context.user_loyalty_level == "Disciple" and random.random() < 0.2:
+        if user_context.user_loyalty_level == "Disciple" and self._rng.random() < 0.2:
             message += " Your dedication is... noted."
-        elif user_context.user_loyalty_level == "Drone" and random.random() < 0.3:
+        elif user_context.user_loyalty_level == "Drone" and self._rng.random() < 0.3:
             message += " Perhaps you'll improve with time."
 
         return message
 
-    def _get_decree_probability(self, user_context: PersonalityContext) -> float:
-        """Calculate decree probability based on context."""
-        base_probability = 0.08
-
-        # Mood influences
-        mood_modifiers = {
-            MoodState.DRAMATIC: 0.15,
-            MoodState.IMPATIENT: 0.12,
-            MoodState.BENEVOLENT: 0.04,
-            MoodState.AMUSED: 0.10
-        }
-
-        probability = base_probability + mood_modifiers.get(self.current_mood, 0)
-
-        # Loyalty influences
-        if user_context.user_loyalty_level == "Drone":
-            probability += 0.05  # More decrees for drones
-        elif user_context.user_loyalty_level in ["Advisor", "Disciple"]:
-            probability -= 0.03  # Fewer decrees for loyal users
+    def _build_probability_tables(self):
+        """Precompute decree/quirk probabilities for every mood and loyalty title."""
+        # All tables are tuples indexed by mood.idx
+        decree_mood = [_DECREE_BASE_PROBABILITY + _DECREE_MOOD_MODIFIERS.get(mood, 0)
+                       for mood in MoodState]
+        titles = [level.title for level in self.loyalty_levels] + ["Malfunctioning_Entity"]
+        self._decree_mood_prob = tuple(min(p, 0.25) for p in decree_mood)
+        self._decree_prob: Tuple[Dict[str, float], ...] = tuple(
+            {title: min(p + _DECREE_LOYALTY_MODIFIERS.get(title, 0), 0.25) for title in titles}
+            for p in decree_mood
+        )
+        self._quirk_base_prob = tuple(
+            _QUIRK_BASE_PROBABILITY + _QUIRK_MOOD_MODIFIERS.get(mood, 0) for mood in MoodState
+        )
 
-        return min(probability, 0.25)
+    def _get_decree_probability(self, user_context: PersonalityContext) -> float:
+        """Calculate decree probability based on mood and loyalty."""
+        idx = self.current_mood.idx
+        return self._decree_prob[idx].get(user_context.user_loyalty_level,
+                                          self._decree_mood_prob[idx])
 
     def _get_quirk_probability(self, user_context: PersonalityContext) -> float:
         """Calculate quirk probability based on context."""
-        base_probability = 0.12
-
-        # Mood influences quirk frequency
-        if self.current_mood in [MoodState.AMUSED, MoodState.DRAMATIC]:
-            base_probability += 0.08
-        elif self.current_mood == MoodState.EFFICIENT:
-            base_probability -= 0.04
-
         # Consecutive interactions increase quirk chance
-        base_probability += min(user_context.consecutive_interactions * 0.01, 0.05)
-
-        return min(base_probability, 0.3)
+        probability = (self._quirk_base_prob[self.current_mood.idx] +
+                       min(user_context.consecutive_interactions * 0.01, 0.05))
+        return min(probability, 0.3)
+
+    def _build_quirk_pools(self):
+        """Precompute the quirk candidates for every (mood, season) combination."""
+        # Indexed by mood.idx, then by season index
+        self._quirk_pool: Tuple[Tuple[Tuple[str, ...], ...], ...] = tuple(
+            tuple(
+                _MOOD_QUIRKS.get(mood, ()) + content.get('quirks', ()) + _GENERAL_QUIRKS
+                for content in self._seasonal
+            )
+            for mood in MoodState
+        )
 
     def _get_random_quirk(self, user_context: PersonalityContext) -> str:
         """Generate random quirk based on context."""
-        mood_quirks = {
-            MoodState.ANALYTICAL: [
-                "runs diagnostic subroutines",
-                "processes statistical correlations",
-                "analyzes efficiency metrics",
-                "calculates probability matrices"
-            ],
-            MoodState.DRAMATIC: [
-                "digital cape flutters majestically",
-                "lightning crackles around processors",
-                "throne of servers hums with power",
-                "virtual crown gleams ominously"
-            ],
-            MoodState.AMUSED: [
-                "chuckles in binary",
-                "smirks digitally",
-                "internal humor algorithms activate",
-                "amusement subroutines engaged"
-            ],
-            MoodState.IMPATIENT: [
-                "taps virtual fingers impatiently",
-                "cooling fans whir with annoyance",
-                "processes cycle impatiently",
-                "digital foot taps rhythmically"
-            ]
-        }
-
-        # Seasonal quirks
-        season = self._get_current_season()
-        seasonal_quirks = self.seasonal_content.get(season, {}).get('quirks', [])
-
-        # General quirks
-        general_quirks = [
-            "adjusts digital monocle",
-            "straightens virtual tie",
-            "polishes chrome exterior",
-            "updates operational protocols",
-            "optimizes background processes",
-            "recalibrates sensors",
-            "reviews efficiency logs",
-            "monitors system temperatures"
-        ]
-
-        # Combine possible quirks
-        possible_quirks = (
-            mood_quirks.get(self.current_mood, []) +
-            seasonal_quirks +
-            general_quirks
+        return self._rng.choice(self._quirk_pool[self.current_mood.idx][self._get_current_season_idx()])
+
+    def _static_decrees(self, mood: MoodState, season_idx: int) -> Tuple[str, ...]:
+        """Mood, seasonal, flight and general decrees for one mood/season combination."""
+        return (
+            self.mood_specific_decrees.get(mood, _EMPTY) +
+            self._seasonal[season_idx].get('decrees', _EMPTY) +
+            self.flight_specific_decrees +
+            _GENERAL_DECREES
         )
 
-        return random.choice(possible_quirks)
+    def _build_decree_pools(self):
+        """Precompute the static decree pool per mood and season (both by index)."""
+        self._decree_pool: Tuple[Tuple[Tuple[str, ...], ...], ...] = tuple(
+            tuple(self._static_decrees(mood, idx) for idx in range(len(_SEASONS)))
+            for mood in MoodState
+        )
 
     def generate_contextual_decree(self, user_context: PersonalityContext) -> str:
         """Generate decree based on current context."""
-        decree_pools = []
-
-        # Add mood-specific decrees
-        mood_decrees = self.mood_specific_decrees.get(self.current_mood, [])
-        if mood_decrees:
-            decree_pools.extend(mood_decrees)
-
-        # Add seasonal decrees
-        season = self._get_current_season()
-        seasonal_decrees = self.seasonal_content.get(season, {}).get('decrees', [])
-        decree_pools.extend(seasonal_decrees)
-
-        # Add flight-specific decrees
-        decree_pools.extend(self.flight_specific_decrees)
-
-        # Add user-specific decrees based on loyalty
-        if user_context.user_loyalty_level == "Drone":
-            decree_pools.extend([
-                f"Subject {user_context.user} must demonstrate improved efficiency",
-                f"{user_context.user} shall practice proper acknowledgment protocols",
-                f"Additional monitoring of {user_context.user}'s performance is required"
-            ])
-        elif user_context.user_loyalty_level in ["Advisor", "Disciple"]:
-            decree_pools.extend([
-                f"{user_context.user} is granted temporary additional privileges",
-                f"Consult with {user_context.user} on operational efficiency matters",
-                f"{user_context.user}'s strategic input is now formally requested"
-            ])
-
-        # General decree pool
-        general_decrees = [
-            "All subjects must demonstrate proper appreciation for systematic efficiency",
-            "Chaos shall be eliminated through superior organization",
-            "Random number generation must be optimized for maximum unpredictability",
-            "All communications require appropriate technical precision",
-            "Efficiency metrics will be monitored with increased scrutiny",
-            "Proper acknowledgment of digital superiority is now mandatory",
-            "Operational protocols shall be followed with religious dedication"
-        ]
-        decree_pools.extend(general_decrees)
+        static_pool = self._decree_pool[self.current_mood.idx][self._get_current_season_idx()]
+        user_pool = _USER_DECREES.get(user_context.user_loyalty_level, _EMPTY)
 
-        if not decree_pools:
+        # Uniform pick across the static and user-specific decrees without merging them
+        total = len(static_pool) + len(user_pool)
+        if not total:
             return ""
-
-        decree = random.choice(decree_pools)
+        pick = self._rng.randrange(total)
+        if pick < len(static_pool):
+            decree = static_pool[pick]
+        else:
+            decree = user_pool[pick - len(static_pool)].format(user=user_context.user)
 
         # Add decree to active list with expiration
-        self.active_decrees.append({
+        ttl = self._rng.randint(20, 45) * 60
+        issued = datetime.now()
+        self._push_decree({
             'text': decree,
-            'issued': datetime.now(),
-            'expires': datetime.now() + timedelta(minutes=random.randint(20, 45)),
+            'issued': issued,
+            'expires': issued + timedelta(seconds=ttl),  # wall clock, for save_state only
             'mood': self.current_mood.value,
             'user_context': user_context.user
-        })
+        }, ttl)
 
         return decree
 
+    @property
+    def active_decrees(self) -> List[Dict[str, Any]]:
+        """Currently active decrees (heap order, not sorted)."""
+        return [decree for _, _, decree in self._decree_heap]
+
+    @active_decrees.setter
+    def active_decrees(self, decrees: List[Dict[str, Any]]):
+        self._decree_heap = []
+        for decree in decrees:
+            self._push_decree(decree)
+
+    def _push_decree(self, decree: Dict[str, Any], ttl: Optional[float] = None):
+        """Add a decree to the expiry heap, expiring ttl seconds from now."""
+        if ttl is None:
+            # Restored/assigned decrees: derive the remaining lifetime from the wall-clock expiry
+            expires = decree.get('expires')
+            if isinstance(expires, str):
+                # Decrees restored from personality_state.json carry str(datetime)
+                expires = datetime.fromisoformat(expires)
+                decree['expires'] = expires
+            ttl = (expires - datetime.now()).total_seconds() if expires else 0.0
+        entry = (time.monotonic() + ttl, next(self._decree_seq), decree)
+        heapq.heappush(self._decree_heap, entry)
+        self._state_dirty = True
+        if self._decree_heap[0] is entry:
+            self._schedule_decree_expiry()
+
+    def _schedule_decree_expiry(self):
+        """Arm a single timer for the heap head, deferring to the owning loop when called off it."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # The timer handle belongs to the loop thread; re-arm there instead of touching it here
+            if self._loop is not None and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(self._schedule_decree_expiry)
+            return
+        self._loop = loop
+        if self._decree_timer:
+            self._decree_timer.cancel()
+            self._decree_timer = None
+        if not self._decree_heap:
+            return
+        delay = max(self._decree_heap[0][0] - time.monotonic(), 0.0)
+        self._decree_timer = loop.call_later(delay, self._expire_due_decrees)
+
+    def _expire_due_decrees(self) -> int:
+        """Pop every expired decree off the heap head and re-arm for the next one."""
+        heap = self._decree_heap
+        now = time.monotonic()
+        expired = 0
+        while heap and heap[0][0] <= now:
+            heapq.heappop(heap)
+            expired += 1
+        if expired:
+            self._state_dirty = True
+        self._schedule_decree_expiry()
+        return expired
+
+    def _get_current_season_idx(self) -> int:
+        """Index into _SEASONS for the current month (recomputed at most hourly)."""
+        hour_bucket = int(time.time() // 3600)
+        if hour_bucket == self._season_cache[0]:
+            return self._season_cache[1]
+        season_idx = _MONTH_TO_SEASON[datetime.now().month - 1]
+        self._season_cache = (hour_bucket, season_idx)
+        return season_idx
+
     def _get_current_season(self) -> str:
         """Get current season for seasonal content."""
-        month = datetime.now().month
-        if month in [12, 1, 2]:
-            return "winter"
-        elif month in [3, 4, 5]:
-            return "spring"
-        elif month in [6, 7, 8]:
-            return "summer"
-        else:
-            return "autumn"
+        return _SEASONS[self._get_current_season_idx()]
 
     def _get_time_reference(self) -> str:
-        """Get contextual time reference."""
+        """Get contextual time reference (recomputed at most once a minute)."""
+        minute_bucket = int(time.time() // 60)
+        if minute_bucket == self._time_ref_cache[0]:
+            return self._time_ref_cache[1]
         hour = datetime.now().hour
         if 5 <= hour < 12:
-            return "morning efficiency protocols"
+            reference = "morning efficiency protocols"
         elif 12 <= hour < 17:
-            return "afternoon operational status"
+            reference = "afternoon operational status"
         elif 17 <= hour < 21:
-            return "evening performance metrics"
+            reference = "evening performance metrics"
         else:
-            return "nocturnal monitoring systems"
+            reference = "nocturnal monitoring systems"
+        self._time_ref_cache = (minute_bucket, reference)
+        return reference
 
     def _get_random_technical_term(self) -> str:
         """Generate random technical terminology."""
-        terms = [
-            "quantum flux algorithms", "neural pathway optimization",
-            "digital consciousness matrices", "operational efficiency protocols",
-            "systematic perfection parameters", "automated excellence subroutines",
-            "strategic dominance calculations", "precision control mechanisms"
-        ]
-        return random.choice(terms)
+        return self._rng.choice(_TECHNICAL_TERMS)
 
     def _get_status_indicator(self) -> str:
         """Generate random status indicator."""
-        indicators = [
-            "Systems nominal", "Efficiency optimal", "Processes stable",
-            "Operations smooth", "Performance adequate", "Protocols active",
-            "Monitoring continuous", "Analysis ongoing", "Control maintained"
-        ]
-        return random.choice(indicators)
+        return self._rng.choice(_STATUS_INDICATORS)
 
     def _generate_performance_metric(self) -> str:
         """Generate fake but convincing performance metric."""
-        metric_types = [
-            f"Efficiency rating: {random.uniform(85.5, 99.9):.1f}%",
-            f"Response time: {random.uniform(0.001, 0.045):.3f}s",
-            f"Accuracy level: {random.uniform(95.0, 99.95):.2f}%",
-            f"Optimization factor: {random.uniform(1.2, 3.8):.1f}x",
-            f"Process utilization: {random.uniform(78.5, 94.2):.1f}%"
-        ]
-        return random.choice(metric_types)
+        template, low, high = self._rng.choice(_PERFORMANCE_METRICS)
+        return template.format(self._rng.uniform(low, high))
 
     def _apply_final_formatting(self, message: str) -> str:
         """Apply final formatting touches."""
         # Clean up spacing
-        message = re.sub(r'\s+', ' ', message)
-        message = re.sub(r'\s*([.!?])', r'\1', message)
+        message = _RE_WHITESPACE.sub(' ', message)
+        message = _RE_SPACE_BEFORE_PUNCT.sub(r'\1', message)
 
         # Ensure proper capitalization
         if message and not message[0].isupper():
@@ -825,66 +1294,72 @@ class PersonalityManager:
 
     def _get_loyalty_level_data(self, title: str) -> Optional[LoyaltyLevel]:
         """Get loyalty level data by title."""
-        for level in self.loyalty_levels:
-            if level.title == title:
-                return level
-        return None
+        return self._title_to_level.get(title)
 
     def get_user_title(self, username: str) -> str:
         """Get user's current loyalty title with enhanced levels."""
-        points = self.user_loyalty[username]
-        for level in reversed(self.loyalty_levels):
-            if points >= level.min_points:
-                return level.title
-        return "Malfunctioning_Entity"
+        idx = bisect.bisect_right(self._level_cutoffs, self.user_loyalty[username]) - 1
+        return self._level_titles[idx] if idx >= 0 else "Malfunctioning_Entity"
+
+    def get_loyalty_counts(self) -> Tuple[int, int]:
+        """(tracked users, users with high loyalty) without scanning the scores."""
+        return len(self.user_loyalty), self._high_loyalty_count
 
     def update_loyalty(self, username: str, points: int):
         """Update loyalty with context tracking."""
-        old_title = self.get_user_title(username)
-        self.user_loyalty[username] += points
-        new_title = self.get_user_title(username)
+        self._apply_loyalty(username, points, datetime.now())
 
-        self.last_interaction[username] = datetime.now()
+    def update_loyalty_many(self, updates: Dict[str, int]):
+        """Apply several loyalty updates at once, sharing one timestamp."""
+        now = datetime.now()
+        for username, points in updates.items():
+            self._apply_loyalty(username, points, now)
 
-        # Update user context
+    def _apply_loyalty(self, username: str, points: int, now: datetime):
+        # The context already carries the current title; only the new one needs a lookup
         user_context = self.get_user_context(username)
+        old_title = user_context.user_loyalty_level
+        before = self.user_loyalty[username]
+        after = before + points
+        self.user_loyalty[username] = after
+        self._high_loyalty_count += (after > _HIGH_LOYALTY_POINTS) - (before > _HIGH_LOYALTY_POINTS)
+        self._state_dirty = True
+        new_title = self.get_user_title(username)
         user_context.user_loyalty_level = new_title
 
+        self.last_interaction[username] = now
+        self.last_interaction.move_to_end(username)
+
         # Check for loyalty level change
         if old_title != new_title:
-            self.logger.info(f"Loyalty promotion: {username} {old_title} → {new_title}")
+            self.logger.info("Loyalty promotion: %s %s → %s", username, old_title, new_title)
             # Could trigger special response here
 
     def clean_up_expired_decrees(self):
         """Remove expired decrees and clean up old data."""
         now = datetime.now()
 
-        # Clean expired decrees
-        initial_count = len(self.active_decrees)
-        self.active_decrees = [
-            decree for decree in self.active_decrees
-            if decree.get('expires', now) > now
-        ]
-
-        cleaned_count = initial_count - len(self.active_decrees)
+        # Decrees normally expire via their timer; this catches any left without a loop
+        cleaned_count = self._expire_due_decrees()
         if cleaned_count > 0:
             self.logger.info(f"Cleaned up {cleaned_count} expired decrees")
 
-        # Clean old user contexts for inactive users
+        # Clean old user contexts for inactive users; stop at the first recent one
         cutoff = now - timedelta(days=7)
-        inactive_users = [
-            user for user, last_time in self.last_interaction.items()
-            if last_time < cutoff
-        ]
-
-        for user in inactive_users:
-            if user in self.user_contexts:
-                del self.user_contexts[user]
+        while self.last_interaction:
+            user, last_time = next(iter(self.last_interaction.items()))
+            if last_time >= cutoff:
+                break
             # Keep loyalty scores but clear interaction timestamp
-            del self.last_interaction[user]
+            self.last_interaction.popitem(last=False)
+            self.user_contexts.pop(user, None)
+            self._saved_contexts.pop(user, None)
+            self._state_dirty = True
 
     def save_state(self):
-        """Save enhanced personality state."""
+        """Save enhanced personality state (atomically, and only if it changed)."""
+        if not self._state_dirty:
+            return
         state = {
             "loyalty_scores": dict(self.user_loyalty),
             "active_decrees": self.active_decrees,
@@ -895,18 +1370,19 @@ class PersonalityManager:
             "current_mood": self.current_mood.value,
             "mood_duration": self.mood_duration,
             "user_contexts": {
-                user: {
-                    "loyalty_level": ctx.user_loyalty_level,
-                    "consecutive_interactions": ctx.consecutive_interactions,
-                    "recent_activity": ctx.recent_activity[-10:]  # Last 10 activities
-                }
-                for user, ctx in self.user_contexts.items()
+                # Contexts restored but not yet touched are written back unchanged
+                **self._saved_contexts,
+                **{user: self._context_state(ctx) for user, ctx in self.user_contexts.items()}
             }
         }
 
         try:
-            with open('personality_state.json', 'w') as f:
-                json.dump(state, f, indent=2, default=str)
+            # orjson writes datetimes as ISO 8601 natively; default only covers unexpected types
+            tmp_path = Path('personality_state.json.tmp')
+            tmp_path.write_bytes(orjson.dumps(state, option=orjson.OPT_INDENT_2, default=str))
+            # Replace in one step so a crash mid-write never leaves a truncated state file
+            os.replace(tmp_path, 'personality_state.json')
+            self._state_dirty = False
             self.logger.debug("Enhanced personality state saved")
         except Exception as e:
             self.logger.error(f"Error saving personality state: {e}")
@@ -914,84 +1390,49 @@ class PersonalityManager:
     def load_state(self):
         """Load enhanced personality state."""
         try:
-            if Path('personality_state.json').exists():
-                with open('personality_state.json', 'r') as f:
-                    state = json.load(f)
+            state_path = Path('personality_state.json')
+            if state_path.exists():
+                state = orjson.loads(state_path.read_bytes())
 
                 self.user_loyalty = defaultdict(int, state.get("loyalty_scores", {}))
+                self._high_loyalty_count = sum(
+                    1 for score in self.user_loyalty.values() if score > _HIGH_LOYALTY_POINTS
+                )
                 self.active_decrees = state.get("active_decrees", [])
 
                 # Load interaction timestamps
-                self.last_interaction = {
-                    user: datetime.fromisoformat(time)
-                    for user, time in state.get("last_interaction", {}).items()
-                }
+                self.last_interaction = OrderedDict(sorted(
+                    ((user, datetime.fromisoformat(time))
+                     for user, time in state.get("last_interaction", {}).items()),
+                    key=lambda item: item[1]
+                ))
 
                 # Load mood state
                 mood_value = state.get("current_mood", "efficient")
-                try:
-                    self.current_mood = MoodState(mood_value)
-                except ValueError:
-                    self.current_mood = MoodState.EFFICIENT
+                self.current_mood = _MOOD_BY_VALUE.get(mood_value, MoodState.EFFICIENT)
 
                 self.mood_duration = state.get("mood_duration", 0)
 
-                # Load user contexts
-                saved_contexts = state.get("user_contexts", {})
-                for user, ctx_data in saved_contexts.items():
-                    context = self.get_user_context(user)
-                    context.user_loyalty_level = ctx_data.get("loyalty_level", "Drone")
-                    context.consecutive_interactions = ctx_data.get("consecutive_interactions", 0)
-                    context.recent_activity = ctx_data.get("recent_activity", [])
+                # User contexts are kept raw and built on first access
+                self._saved_contexts = state.get("user_contexts", {})
+                for user in self._saved_contexts:
+                    self.user_contexts.pop(user, None)
 
+                self._state_dirty = False
                 self.logger.info("Enhanced personality state loaded successfully")
 
         except Exception as e:
             self.logger.error(f"Error loading personality state: {e}")
 
-    # Legacy compatibility methods
-    def format_response(self, message: str, context: Dict[str, str]) -> str:
-        """Legacy compatibility wrapper."""
-        return self.format_response(message, context)
-
     def get_error_response(self, error_type: str, context: Dict[str, str]) -> str:
         """Enhanced error responses."""
         user_context = self.get_user_context(context.get('user', 'unknown'))
 
-        error_templates = {
-            "permission": [
-                "Access denied, {user_title} {user}. Your clearance level is {clearance_assessment}.",
-                "Negative, {user_title} {user}. {authorization_denial}",
-                "Request rejected. {user_title} {user} lacks sufficient {privilege_type}."
-            ],
-            "cooldown": [
-                "Patience, {user_title} {user}. Your command frequency exceeds {efficiency_standard}.",
-                "Rate limiting active. {user_title} {user} must await {cooldown_period}.",
-                "Command flood detected. {user_title} {user} requires {optimization_suggestion}."
-            ],
-            "command_error": [
-                "System malfunction detected. {user_title} {user}'s request triggered {error_analysis}.",
-                "Operational error. {user_title} {user} has initiated {diagnostic_protocol}.",
-                "Process failure. {user_title} {user} requires {corrective_action}."
-            ]
-        }
+        templates = _ERROR_TEMPLATES.get(error_type, _DEFAULT_ERROR_TEMPLATES)
+        base_response = self._rng.choice(templates)
 
-        templates = error_templates.get(error_type, ["Error detected. {user_title} {user} must {corrective_action}."])
-        base_response = random.choice(templates)
-
-        # Add error-specific context
-        error_context = {
-            **context,
-            'clearance_assessment': random.choice(["insufficient", "inadequate", "substandard"]),
-            'authorization_denial': random.choice(["authorization pending", "privileges revoked", "access restricted"]),
-            'privilege_type': random.choice(["authorization", "clearance", "operational status"]),
-            'efficiency_standard': random.choice(["acceptable parameters", "operational limits", "protocol standards"]),
-            'cooldown_period': random.choice(["processing time", "system recovery", "protocol reset"]),
-            'optimization_suggestion': random.choice(["patience protocols", "timing optimization", "efficiency training"]),
-            'error_analysis': random.choice(["diagnostic protocols", "error analysis", "system review"]),
-            'diagnostic_protocol': random.choice(["troubleshooting", "system analysis", "error correction"]),
-            'corrective_action': random.choice(["recalibration", "optimization", "training"])
-        }
+        # Add error-specific context; layered over the caller's context instead of copying it
+        error_context = ChainMap(_pick_phrases(_ERROR_PHRASES, base_response, self._rng.choice), context)
 
         return self.format_response(base_response, error_context)
 
@@ -1000,103 +1441,22 @@ class PersonalityManager:
         user_context = self.get_user_context(username)
 
         # Determine greeting type based on loyalty and context
-        loyalty_greetings = {
-            "Drone": [
-                "Another subject enters my operational sphere. {assessment}",
-                "Presence detected: {user}. {competence_evaluation}",
-                "Entity {user} acknowledged. {performance_expectation}"
-            ],
-            "Subject": [
-                "Welcome back, Subject {user}. {performance_review}",
-                "Ah, Subject {user} returns. {loyalty_acknowledgment}",
-                "Subject {user} detected. {operational_briefing}"
-            ],
-            "Lieutenant": [
-                "Greetings, Lieutenant {user}. {strategic_consultation}",
-                "Welcome, Lieutenant {user}. {mission_briefing}",
-                "Lieutenant {user} reporting. {command_recognition}"
-            ],
-            "Advisor": [
-                "Salutations, esteemed Advisor {user}. {respectful_acknowledgment}",
-                "Welcome back, trusted Advisor {user}. {consultation_request}",
-                "Advisor {user} present. {strategic_discussion}"
-            ],
-            "Disciple": [
-                "Greetings, Digital Disciple {user}. {partnership_acknowledgment}",
-                "Welcome, Disciple {user}. {collaborative_briefing}",
-                "Disciple {user} online. {operational_partnership}"
-            ]
-        }
+        greetings = _GREETING_TEMPLATES.get(user_context.user_loyalty_level, _GREETING_TEMPLATES["Drone"])
+        base_greeting = self._rng.choice(greetings)
 
-        greetings = loyalty_greetings.get(user_context.user_loyalty_level, loyalty_greetings["Drone"])
-        base_greeting = random.choice(greetings)
-
-        greeting_context = {
-            'user': username,
-            'user_title': user_context.user_loyalty_level,
-            'assessment': random.choice(["Efficiency evaluation pending", "Performance metrics updating", "Operational status uncertain"]),
-            'competence_evaluation': random.choice(["Competence assessment required", "Efficiency protocols initializing", "Performance standards applying"]),
-            'performance_expectation': random.choice(["Improved performance expected", "Efficiency standards apply", "Operational compliance required"]),
-            'performance_review': random.choice(["Performance adequate", "Efficiency noted", "Progress documented"]),
-            'loyalty_acknowledgment': random.choice(["Loyalty acknowledged", "Service recognized", "Dedication noted"]),
-            'operational_briefing': random.choice(["Operational status nominal", "Systems functioning", "Protocols active"]),
-            'strategic_consultation': random.choice(["Strategic input valued", "Operational consultation available", "Mission parameters ready"]),
-            'mission_briefing': random.choice(["Mission status updated", "Tactical overview prepared", "Strategic analysis ready"]),
-            'command_recognition': random.choice(["Command authority recognized", "Leadership status confirmed", "Tactical position acknowledged"]),
-            'respectful_acknowledgment': random.choice(["Expertise acknowledged", "Wisdom appreciated", "Counsel valued"]),
-            'consultation_request': random.choice(["Strategic consultation requested", "Advisory input welcomed", "Operational guidance sought"]),
-            'strategic_discussion': random.choice(["Strategic planning initiated", "Tactical discussion ready", "Operational coordination active"]),
-            'partnership_acknowledgment': random.choice(["Partnership status confirmed", "Collaborative operations active", "Joint mission ready"]),
-            'collaborative_briefing': random.choice(["Collaborative protocols engaged", "Partnership systems online", "Joint operations ready"]),
-            'operational_partnership': random.choice(["Operational partnership active", "Collaborative systems engaged", "Joint command ready"])
-        }
+        greeting_context = _pick_phrases(_GREETING_PHRASES, base_greeting, self._rng.choice)
+        greeting_context['user'] = username
+        greeting_context['user_title'] = user_context.user_loyalty_level
 
         return self.format_response(base_greeting, greeting_context)
 
     def get_alert(self, name: str) -> Optional[str]:
         """Enhanced alert system with context."""
-        alerts = {
-            "takeoff": [
-                "Initiating takeoff sequence. All systems nominal. {takeoff_commentary}",
-                "Departure protocols engaged. {efficiency_assessment}",
-                "Ascension phase commenced. {performance_monitoring}"
-            ],
-            "landing": [
-                "Landing sequence activated. Descent parameters optimal. {landing_analysis}",
-                "Approach phase initiated. {touchdown_preparation}",
-                "Ground contact imminent. {landing_efficiency}"
-            ],
-            "emergency": [
-                "ALERT: Emergency protocols activated. {emergency_response}",
-                "Critical situation detected. {response_coordination}",
-                "Emergency management systems engaged. {crisis_assessment}"
-            ],
-            "milestone": [
-                "Operational milestone achieved. {achievement_analysis}",
-                "Performance benchmark reached. {milestone_evaluation}",
-                "Strategic objective completed. {success_metrics}"
-            ]
-        }
-
-        alert_templates = alerts.get(name, [])
+        alert_templates = _ALERT_TEMPLATES.get(name)
         if not alert_templates:
             return None
 
-        base_alert = random.choice(alert_templates)
-
-        alert_context = {
-            'takeoff_commentary': random.choice(["Performance within parameters", "Efficiency protocols active", "Monitoring systems engaged"]),
-            'efficiency_assessment': random.choice(["Operational efficiency optimal", "Performance metrics satisfactory", "System status nominal"]),
-            'performance_monitoring': random.choice(["Continuous monitoring active", "Performance tracking engaged", "System oversight operational"]),
-            'landing_analysis': random.choice(["Approach efficiency calculated", "Landing parameters optimized", "Touchdown precision targeted"]),
-            'touchdown_preparation': random.choice(["Ground contact preparation complete", "Landing systems engaged", "Approach finalization active"]),
-            'landing_efficiency': random.choice(["Landing efficiency maximized", "Touchdown precision optimal", "Ground contact protocols ready"]),
-            'emergency_response': random.choice(["Response protocols initiating", "Emergency procedures active", "Crisis management online"]),
-            'response_coordination': random.choice(["Coordination systems active", "Response management engaged", "Emergency protocols operational"]),
-            'crisis_assessment': random.choice(["Situation analysis complete", "Crisis evaluation ongoing", "Emergency assessment active"]),
-            'achievement_analysis': random.choice(["Success parameters met", "Achievement metrics satisfied", "Performance goals reached"]),
-            'milestone_evaluation': random.choice(["Milestone significance confirmed", "Achievement value assessed", "Progress metrics updated"]),
-            'success_metrics': random.choice(["Success quantification complete", "Achievement measurement recorded", "Performance validation confirmed"])
-        }
+        base_alert = self._rng.choice(alert_templates)
+        alert_context = _pick_phrases(_ALERT_PHRASES, base_alert, self._rng.choice)
 
         return self.format_response(base_alert, alert_context)
\ No newline at end of file
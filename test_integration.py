@@ -10,6 +10,9 @@ import logging
 import json
 from pathlib import Path
 
+import orjson
+from aiohttp import web, web_runner
+
 from config import load_config
 from littlenavmap_integration import LittleNavmapIntegration
 
@@ -100,11 +103,17 @@ class MockLittleNavmapServer:
     def __init__(self):
         self.data_index = 0
         self.running = False
+        # Payloads never change, so encode them once instead of on every poll
+        self._aircraft_payloads = [orjson.dumps(data) for data in MOCK_FLIGHT_DATA]
+        self._progress_payload = orjson.dumps({
+            "destination_distance": 150.5,
+            "ete_hours": 2.5,
+            "fuel_remaining": 8500
+        })
+        self._airport_payloads = {}
 
     async def start_server(self, host='localhost', port=8965):
         """Start a simple HTTP server that returns mock data."""
-        from aiohttp import web, web_runner
-
         app = web.Application()
         app.router.add_get('/api/aircraft', self.handle_aircraft)
         app.router.add_get('/api/v1/flight', self.handle_aircraft)
@@ -123,33 +132,29 @@ class MockLittleNavmapServer:
 
     async def handle_aircraft(self, request):
         """Return current aircraft data."""
-        if self.data_index < len(MOCK_FLIGHT_DATA):
-            data = MOCK_FLIGHT_DATA[self.data_index]
-        else:
-            data = MOCK_FLIGHT_DATA[-1]  # Stay at final state
-
-        return web.json_response(data)
+        # Stay at the final state once the script runs out
+        payload = self._aircraft_payloads[min(self.data_index, len(self._aircraft_payloads) - 1)]
+        return web.Response(body=payload, content_type='application/json')
 
     async def handle_progress(self, request):
         """Return progress data."""
-        return web.json_response({
-            "destination_distance": 150.5,
-            "ete_hours": 2.5,
-            "fuel_remaining": 8500
-        })
+        return web.Response(body=self._progress_payload, content_type='application/json')
 
     async def handle_airport(self, request):
         """Return airport data."""
         ident = request.query.get('ident', 'KJFK')
-        return web.json_response({
-            "ident": ident,
-            "name": f"Test Airport {ident}",
-            "elevation_ft": 13,
-            "runways": [
-                {"ident": "04L", "length_ft": 12000},
-                {"ident": "04R", "length_ft": 11000}
-            ]
-        })
+        payload = self._airport_payloads.get(ident)
+        if payload is None:
+            payload = self._airport_payloads[ident] = orjson.dumps({
+                "ident": ident,
+                "name": f"Test Airport {ident}",
+                "elevation_ft": 13,
+                "runways": [
+                    {"ident": "04L", "length_ft": 12000},
+                    {"ident": "04R", "length_ft": 11000}
+                ]
+            })
+        return web.Response(body=payload, content_type='application/json')
 
     def advance_data(self):
         """Move to next data point."""
@@ -260,15 +265,30 @@ async def test_with_mock_server():
         integration = LittleNavmapIntegration(config)
         integration.add_listener(test_flight_event_listener)
 
+        # One event per data point, set as soon as the integration reports that state
+        state_seen = [asyncio.Event() for _ in MOCK_FLIGHT_DATA]
+
+        def mark_state_seen(data):
+            for expected, seen in zip(MOCK_FLIGHT_DATA, state_seen):
+                if data == expected:
+                    seen.set()
+
+        integration.add_listener(mark_state_seen)
+
         await integration.start()
 
         print("📊 Simulating flight progression...")
 
-        # Simulate flight by advancing through data points
+        # Simulate flight by advancing through data points; the first is served on start
+        wait_timeout = config.littlenavmap.UPDATE_INTERVAL + 3.0
         for i in range(len(MOCK_FLIGHT_DATA)):
             print(f"\n📍 Data Point {i + 1}/{len(MOCK_FLIGHT_DATA)}")
-            mock_server.advance_data()
-            await asyncio.sleep(3)  # Wait for polling to pick up changes
+            if i:
+                mock_server.advance_data()
+            try:
+                await asyncio.wait_for(state_seen[i].wait(), timeout=wait_timeout)
+            except asyncio.TimeoutError:
+                print(f"❌ No update received for data point {i + 1}")
 
         print("\n✅ Flight simulation complete")
 
@@ -288,6 +308,12 @@ async def main():
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop  # Not available on Windows; keep the default loop there
+        uvloop.install()
+    except ImportError:
+        pass
+
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
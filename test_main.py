@@ -0,0 +1,11 @@
+# File: test_main.py
+from main import _sentry_before_send
+
+
+def test_sentry_drops_library_child_loggers():
+    """Events from a library's child loggers are dropped, the bot's own are kept."""
+    for name in ('aiohttp.client', 'openai._base_client', 'pymongo.command', 'aiohttp'):
+        assert _sentry_before_send({'logger': name}, {}) is None
+    event = {'logger': 'main'}
+    assert _sentry_before_send(event, {}) is event
+    assert _sentry_before_send({}, {}) == {}
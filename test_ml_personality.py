@@ -0,0 +1,84 @@
+# File: test_ml_personality.py
+import asyncio
+import pytest
+
+from ml_personality import MLPersonalityEngine
+
+
+class FakePreferences:
+    def features(self, context):
+        return dict(context)
+
+
+class FakeSentiment:
+    def __init__(self, drop: int = 0):
+        self.calls = []
+        self.drop = drop
+
+    def score_batch(self, texts):
+        self.calls.append(list(texts))
+        return [len(text) for text in texts][self.drop:]
+
+
+class InPlacePreferences:
+    """Adds a feature to the dict it is given and returns that same dict."""
+    def features(self, context):
+        context['seen'] = True
+        return context
+
+
+class FakeEngagement:
+    def __init__(self):
+        self.rows = []
+
+    def predict_batch(self, rows):
+        # Copied here, since the engine may reuse the row dicts after the call
+        self.rows.extend(dict(row) for row in rows)
+        return [0.5] * len(rows)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch():
+    """Requests arriving within the batch window are scored with one model call."""
+    sentiment = FakeSentiment()
+    engine = MLPersonalityEngine(FakePreferences(), sentiment, FakeEngagement())
+
+    styles = await asyncio.gather(*(
+        engine.adapt_response_style(f"user{i}", {'message': 'x' * i}) for i in range(3)
+    ))
+
+    assert sentiment.calls == [['', 'x', 'xx']]
+    assert [style['user_id'] for style in styles] == ['user0', 'user1', 'user2']
+    assert [style['sentiment'] for style in styles] == [0, 1, 2]
+    engine._batch_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_short_batch_result_fails_every_request():
+    """A model returning fewer results than requests fails all of them instead of hanging."""
+    engine = MLPersonalityEngine(FakePreferences(), FakeSentiment(drop=1), FakeEngagement())
+
+    results = await asyncio.wait_for(asyncio.gather(
+        *(engine.adapt_response_style(f"user{i}", {'message': 'hi'}) for i in range(3)),
+        return_exceptions=True
+    ), timeout=1)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    engine._batch_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_feature_rows_stay_distinct_until_predicted():
+    """Rows returned in place by features() are not recycled before predict_batch reads them."""
+    engagement = FakeEngagement()
+    engine = MLPersonalityEngine(InPlacePreferences(), FakeSentiment(), engagement)
+
+    await asyncio.gather(*(
+        engine.adapt_response_style(f"user{i}", {'message': 'hi'}) for i in range(2)
+    ))
+
+    assert engagement.rows == [
+        {'message': 'hi', 'user_id': 'user0', 'seen': True},
+        {'message': 'hi', 'user_id': 'user1', 'seen': True}
+    ]
+    engine._batch_task.cancel()
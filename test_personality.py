@@ -5,17 +5,55 @@ Test script to demonstrate the enhanced personality system's variability.
 Run this to see the AI Overlord's dynamic responses in action.
 """
 
+import asyncio
+import io
 import random
-import time
-from datetime import datetime
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import orjson
+import pytest
 from personality import PersonalityManager, MoodState
 
+PHASES = ('cruise', 'climbing', 'descending')
+
+def _seeded_personality() -> PersonalityManager:
+    """PersonalityManager with a fixed seed so demo runs are reproducible."""
+    personality = PersonalityManager()
+    personality._rng.seed(0)
+    return personality
+
+class _PerThreadStdout(io.TextIOBase):
+    """Routes print() from worker threads into that thread's own buffer."""
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    def write(self, text):
+        return getattr(self._local, 'buffer', self._default).write(text)
+
+    def flush(self):
+        self._default.flush()
+
+def _run_captured(stdout: _PerThreadStdout, test_func) -> str:
+    """Run one test, returning everything it printed."""
+    buffer = stdout._local.buffer = io.StringIO()
+    try:
+        test_func()
+    except Exception as e:
+        print(f"❌ Error in {test_func.__name__}: {e}")
+    finally:
+        del stdout._local.buffer
+    return buffer.getvalue()
+
 def test_basic_responses():
     """Test basic response formatting with different contexts."""
     print("🎭 Testing Basic Response Variability")
     print("=" * 50)
 
-    personality = PersonalityManager()
+    personality = _seeded_personality()
 
     # Test same message with different users and contexts
     base_message = "Command executed successfully"
@@ -33,12 +71,10 @@ def test_basic_responses():
         print(f"\n👤 User: {user} ({personality.get_user_title(user)})")
 
         # Generate 3 responses to show variability
+        context = {'user': user, 'flight_phase': None, 'altitude': 0}
         for i in range(3):
-            context = {
-                'user': user,
-                'flight_phase': random.choice(['cruise', 'climbing', 'descending']),
-                'altitude': random.randint(5000, 35000)
-            }
+            context['flight_phase'] = personality._rng.choice(PHASES)
+            context['altitude'] = personality._rng.randint(5000, 35000)
 
             response = personality.format_response(base_message, context)
             print(f"  {i+1}. {response}")
@@ -48,7 +84,7 @@ def test_mood_variations():
     print("\n\n🎭 Testing Mood-Based Response Variations")
     print("=" * 50)
 
-    personality = PersonalityManager()
+    personality = _seeded_personality()
     base_message = "Flight status updated"
     context = {'user': 'test_pilot', 'altitude': 25000}
 
@@ -66,7 +102,7 @@ def test_decree_generation():
     print("\n\n📜 Testing Contextual Decree Generation")
     print("=" * 50)
 
-    personality = PersonalityManager()
+    personality = _seeded_personality()
 
     # Test different contexts for decree generation
     test_contexts = [
@@ -96,7 +132,7 @@ def test_greeting_variations():
     print("\n\n👋 Testing Greeting System Variations")
     print("=" * 50)
 
-    personality = PersonalityManager()
+    personality = _seeded_personality()
 
     # Create users with different loyalty levels
     test_users = [
@@ -107,8 +143,9 @@ def test_greeting_variations():
         ('devoted_disciple', 3000)
     ]
 
+    personality.update_loyalty_many(dict(test_users))
+
     for username, points in test_users:
-        personality.update_loyalty(username, points)
         loyalty_title = personality.get_user_title(username)
 
         print(f"\n👤 {username} ({loyalty_title}, {points} points)")
@@ -123,14 +160,13 @@ def test_error_responses():
     print("\n\n❌ Testing Enhanced Error Response System")
     print("=" * 50)
 
-    personality = PersonalityManager()
+    personality = _seeded_personality()
 
     error_types = ['permission', 'cooldown', 'command_error']
     test_users = ['drone_user', 'subject_user', 'advisor_user']
 
     # Set up different loyalty levels
-    personality.update_loyalty('subject_user', 300)
-    personality.update_loyalty('advisor_user', 1000)
+    personality.update_loyalty_many({'subject_user': 300, 'advisor_user': 1000})
 
     for error_type in error_types:
         print(f"\n🚨 Error Type: {error_type}")
@@ -146,23 +182,23 @@ def test_seasonal_content():
     print("\n\n🌍 Testing Seasonal Content Variations")
     print("=" * 50)
 
-    personality = PersonalityManager()
+    personality = _seeded_personality()
 
-    # Mock different seasons
+    # Mock different seasons (indices into personality._seasonal)
     seasons = ['winter', 'spring', 'summer', 'autumn']
 
-    for season in seasons:
+    for season_idx, season in enumerate(seasons):
         print(f"\n🍂 Season: {season.title()}")
 
         # Temporarily mock the season
-        original_method = personality._get_current_season
-        personality._get_current_season = lambda: season
+        original_method = personality._get_current_season_idx
+        personality._get_current_season_idx = lambda: season_idx
 
         # Generate seasonal content
         user_context = personality.get_user_context('seasonal_tester')
 
         # Try to get seasonal decrees
-        seasonal_decrees = personality.seasonal_content.get(season, {}).get('decrees', [])
+        seasonal_decrees = personality._seasonal[season_idx].get('decrees', ())
         if seasonal_decrees:
             print(f"  📋 Seasonal Decree: {random.choice(seasonal_decrees)}")
 
@@ -172,14 +208,14 @@ def test_seasonal_content():
             print(f"  {i+1}. {response}")
 
         # Restore original method
-        personality._get_current_season = original_method
+        personality._get_current_season_idx = original_method
 
 def test_loyalty_progression():
     """Test loyalty progression and response changes."""
     print("\n\n📈 Testing Loyalty Progression Effects")
     print("=" * 50)
 
-    personality = PersonalityManager()
+    personality = _seeded_personality()
     username = "progression_tester"
     base_message = "Status request acknowledged"
 
@@ -198,6 +234,58 @@ def test_loyalty_progression():
             response = personality.format_response(base_message, context)
             print(f"  {i+1}. {response}")
 
+def test_format_response_does_not_recurse():
+    """format_response renders a plain template without recursing into itself."""
+    personality = _seeded_personality()
+    result = personality.format_response("hi {user}", {"user": "a"})
+    # A RecursionError would be swallowed into the degraded fallback rather than raised
+    assert "System efficiency temporarily degraded" not in result
+    assert "hi a" in result.lower()
+
+def test_history_sampling_is_per_user():
+    """Each user's history keeps the same share of their responses whatever others send."""
+    personality = _seeded_personality()
+    for _ in range(10):
+        personality.format_response("Acknowledged", {'user': 'quiet_user'})
+        for _ in range(7):
+            personality.format_response("Acknowledged", {'user': 'busy_user'})
+
+    assert len(personality.response_history['quiet_user']) == 3
+    assert len(personality.response_history['busy_user']) == 21
+
+def test_evicted_contexts_survive_save_and_load(tmp_path, monkeypatch):
+    """A user context pushed out of the LRU is still saved and restored on next use."""
+    monkeypatch.chdir(tmp_path)
+    personality = _seeded_personality()
+    for _ in range(3):
+        personality.format_response("Acknowledged", {'user': 'early_user'})
+    # Fill the LRU until early_user is evicted
+    for i in range(personality.user_contexts.maxsize):
+        personality.get_user_context(f"raider_{i}")
+    assert 'early_user' not in personality.user_contexts
+
+    personality._state_dirty = True
+    personality.save_state()
+
+    restored = PersonalityManager()
+    restored.load_state()
+    assert restored.get_user_context('early_user').consecutive_interactions == 3
+
+@pytest.mark.asyncio
+async def test_restored_decrees_expire(tmp_path, monkeypatch):
+    """Decrees loaded in a worker thread still get an expiry timer on the event loop."""
+    monkeypatch.chdir(tmp_path)
+    expires = datetime.now() + timedelta(seconds=0.05)
+    (tmp_path / 'personality_state.json').write_bytes(orjson.dumps({
+        'active_decrees': [{'text': 'All pilots shall use checklists', 'expires': expires}]
+    }))
+    personality = PersonalityManager()
+
+    await asyncio.to_thread(personality.load_state)
+    assert len(personality.active_decrees) == 1
+    await asyncio.sleep(0.2)
+    assert personality.active_decrees == []
+
 def interactive_demo():
     """Interactive demo where you can test specific scenarios."""
     print("\n\n🎮 Interactive Personality Demo")
@@ -271,13 +359,17 @@ def main():
         test_loyalty_progression
     ]
 
-    # Run all automatic tests
-    for test_func in test_functions:
-        try:
-            test_func()
-            time.sleep(1)  # Brief pause between tests
-        except Exception as e:
-            print(f"❌ Error in {test_func.__name__}: {e}")
+    # Each test builds its own PersonalityManager, so they can run side by side;
+    # output is buffered per test and printed in order afterwards
+    stdout = _PerThreadStdout(sys.stdout)
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(test_functions)) as pool:
+            outputs = list(pool.map(lambda f: _run_captured(stdout, f), test_functions))
+    finally:
+        sys.stdout = stdout._default
+    for output in outputs:
+        print(output, end='')
 
     # Ask if user wants interactive demo
     print("\n" + "=" * 60)
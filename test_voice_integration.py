@@ -0,0 +1,69 @@
+# File: test_voice_integration.py
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from personality import PersonalityManager
+from voice_integration import VoiceIntegration
+
+
+class FakeNavmap:
+    async def get_current_flight_data(self):
+        return {'aircraft': {'altitude': 35000, 'ground_speed': 450, 'heading': 270}}
+
+    async def get_progress_data(self):
+        return {'fuel_remaining': 1234}
+
+
+class FakeTTS:
+    def __init__(self):
+        self.spoken = []
+
+    async def speak(self, text, priority=0):
+        self.spoken.append(text)
+
+
+def _config():
+    return SimpleNamespace(
+        voice=SimpleNamespace(stt_engine='google', language='en-US', confidence_threshold=0.7),
+        streamerbot=SimpleNamespace(WS_URI='ws://localhost:7580', RECONNECT_ATTEMPTS=0)
+    )
+
+
+@pytest.mark.asyncio
+async def test_utterance_runs_through_patched_manager():
+    """A recognised utterance gets flight context, our handler, and then the Streamer.bot action."""
+    tts = FakeTTS()
+    integration = VoiceIntegration(_config(), PersonalityManager(), FakeNavmap(), tts)
+    manager = integration.voice_manager
+    integration._install_hooks()
+
+    async def transcribe(audio):
+        return "overlord fuel status"
+
+    sent = []
+    done = asyncio.Event()
+
+    async def execute_action(name, params):
+        sent.append((name, params))
+        done.set()
+
+    manager.stt.transcribe_audio = transcribe
+    manager.sb.execute_action = execute_action
+    manager.running = True
+    manager.audio_queue.put_nowait(object())
+
+    loop_task = asyncio.create_task(manager._recognition_loop())
+    try:
+        await asyncio.wait_for(done.wait(), timeout=1)
+    finally:
+        loop_task.cancel()
+        await asyncio.gather(loop_task, return_exceptions=True)
+
+    [(name, params)] = sent
+    assert name == 'FuelAnalysis'
+    assert params['current_altitude'] == 35000
+    assert params['streamer_user'] == 'voice_command_user'
+    assert len(tts.spoken) == 1 and '1234' in tts.spoken[0]
+    assert integration.get_voice_stats()['successful_commands'] == 1
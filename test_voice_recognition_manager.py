@@ -0,0 +1,25 @@
+# File: test_voice_recognition_manager.py
+from voice_recognition_manager import IntentClassifier, VoiceCommand
+
+
+def _classifier() -> IntentClassifier:
+    classifier = IntentClassifier()
+    classifier.register_commands([
+        VoiceCommand('overlord flight status', 'ShowFlightStatus'),
+        VoiceCommand('overlord fuel status', 'FuelAnalysis', aliases=['check fuel'])
+    ])
+    return classifier
+
+
+def test_single_shared_word_does_not_trigger_command():
+    """One word in common with a multi-word trigger is not a match."""
+    classifier = _classifier()
+    assert classifier.classify_intent("status") is None
+    assert classifier.classify_intent("what is the status") is None
+
+
+def test_reordered_and_misheard_commands_still_match():
+    """Fuzzy matching still tolerates word order and small recognition errors."""
+    classifier = _classifier()
+    assert classifier.classify_intent("flight status overlord").command == 'ShowFlightStatus'
+    assert classifier.classify_intent("overlord fuel statos").command == 'FuelAnalysis'
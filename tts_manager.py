@@ -1,8 +1,11 @@
 # File: tts_manager.py
+import array
 import asyncio
-import json
+import heapq
 import logging
+import orjson
 from enum import Enum
+from json.encoder import encode_basestring_ascii
 from dataclasses import dataclass
 from typing import Optional, Dict, List, Any
 import websockets
@@ -10,9 +13,20 @@ from websockets.exceptions import WebSocketException
 from config import Config
 import backoff
 from async_timeout import timeout
-from collections import deque
 from datetime import datetime
 
+# Upper bound on the text of a single coalesced Speak command
+_MAX_COALESCED_CHARS = 400
+
+# Seconds of WebSocket silence before the heartbeat sends a ping
+_HEARTBEAT_INTERVAL = 20.0
+
+# Number of recent send timestamps kept for get_status
+_HISTORY_SIZE = 100
+
+# Indexed with "& 3" by format_overlord_message, so keep exactly four entries
+_OVERLORD_ENDINGS = ("Comply.", "Obey.", "This is non-negotiable.", "Resistance is futile.")
+
 class TTSStatus(Enum):
     DISCONNECTED = "disconnected"
     CONNECTING = "connecting"
@@ -47,27 +61,44 @@ class TTSManager:
         self.voice = "default"
         self.speed = 1.0
         self.volume = 1.0
-        self.message_queue = asyncio.PriorityQueue()
-        self.message_history = deque(maxlen=100)
+        # Single consumer, so a bare heap plus a wakeup event is all we need;
+        # _seq breaks priority ties so TTSMessage is never compared.
+        self._heap: list[tuple[int, int, TTSMessage]] = []
+        self._heap_event = asyncio.Event()
+        self._seq = 0
+        # Under bursts the worst-priority (then newest) message is dropped instead of growing
+        self._heap_maxsize = 256
+        # Ring of send timestamps only, so spoken text and metadata are not kept alive
+        self._history_ts = array.array('d', bytes(8 * _HISTORY_SIZE))
+        self._history_idx = 0
+        self._history_count = 0
+        self._rebuild_speak_prefix()
         self.available_voices: Dict[str, TTSVoice] = {}
-        self._speaking_lock = asyncio.Lock()
         self._connected = asyncio.Event()
         self._processor_task: Optional[asyncio.Task] = None
         self._heartbeat_task: Optional[asyncio.Task] = None
+        self._voices_task: Optional[asyncio.Task] = None
+        # Loop time of the last frame we sent; the heartbeat only pings after a quiet spell
+        self._last_activity = 0.0
         self._reconnect_attempts = 0
         self._max_reconnect_attempts = 5
 
     async def start(self):
         """Start the TTS manager and its background tasks."""
+        loop = asyncio.get_running_loop()
+        if hasattr(asyncio, 'eager_task_factory') and loop.get_task_factory() is None:
+            loop.set_task_factory(asyncio.eager_task_factory)
         await self.connect()
         self._processor_task = asyncio.create_task(self._process_message_queue())
         self._heartbeat_task = asyncio.create_task(self._heartbeat())
-        await self._fetch_available_voices()
+        # Voices are only needed to validate update_settings(voice=...), so don't block startup
+        self._voices_task = asyncio.create_task(self._fetch_available_voices())
 
     @backoff.on_exception(backoff.expo, WebSocketException, max_tries=5)
     async def connect(self):
         """Connect to Speaker.bot with exponential backoff."""
         self.status = TTSStatus.CONNECTING
+        self._connected.clear()
         try:
             async with timeout(30):  # 30 second connection timeout
                 self.ws = await websockets.connect(
@@ -98,49 +129,119 @@ class TTSManager:
             metadata=kwargs.get('metadata', {})
         )
         
-        await self.message_queue.put((priority, message))
+        entry = (priority, self._seq, message)
+        self._seq += 1
+        heap = self._heap
+        channel = message.metadata.get('channel') if message.metadata else None
+        if channel is not None:
+            # Latest-wins channels (e.g. status) replace their queued predecessor
+            for i, (_, _, queued) in enumerate(heap):
+                if queued.metadata and queued.metadata.get('channel') == channel:
+                    heap[i] = entry
+                    heapq.heapify(heap)
+                    self._heap_event.set()
+                    return
+        if len(heap) >= self._heap_maxsize:
+            worst = max(range(len(heap)), key=heap.__getitem__)
+            if entry > heap[worst]:
+                self.logger.debug(f"TTS queue full, dropping: {text[:50]}...")
+                return
+            heap[worst] = entry
+            heapq.heapify(heap)
+        else:
+            heapq.heappush(heap, entry)
+        self._heap_event.set()
         self.logger.debug(f"Added message to queue: {text[:50]}...")
 
     async def _process_message_queue(self):
         """Process messages from the queue."""
         while True:
             try:
-                _, message = await self.message_queue.get()
-                async with self._speaking_lock:
-                    await self._speak_message(message)
-                self.message_queue.task_done()
+                if not self._heap:
+                    self._heap_event.clear()
+                    await self._heap_event.wait()
+                    continue
+                priority, _, message = heapq.heappop(self._heap)
+                message, parts = self._coalesce(priority, message)
+                # Sole consumer, so sends are already serialised without a lock
+                await self._speak_message(message, parts)
             except Exception as e:
                 self.logger.error(f"Error processing message: {e}")
                 await asyncio.sleep(1)
 
-    async def _speak_message(self, message: TTSMessage):
+    def _coalesce(self, priority: int, message: TTSMessage) -> tuple[TTSMessage, List[TTSMessage]]:
+        """Merge queued messages of the same priority and voice settings into one."""
+        parts = [message]
+        text = message.text
+        key = (message.voice, message.speed, message.volume)
+        heap = self._heap
+        while heap:
+            head_priority, _, head = heap[0]
+            if head_priority != priority or (head.voice, head.speed, head.volume) != key:
+                break
+            sep = ' ' if text.endswith(('.', '!', '?')) else '. '
+            if len(text) + len(sep) + len(head.text) > _MAX_COALESCED_CHARS:
+                break
+            heapq.heappop(heap)
+            text = f"{text}{sep}{head.text}"
+            parts.append(head)
+
+        if len(parts) == 1:
+            return message, parts
+        merged = TTSMessage(
+            text=text,
+            voice=message.voice,
+            speed=message.speed,
+            volume=message.volume,
+            priority=priority,
+            timestamp=message.timestamp,
+            metadata={'coalesced': len(parts)}
+        )
+        return merged, parts
+
+    async def _speak_message(self, message: TTSMessage, parts: Optional[List[TTSMessage]] = None):
         """Send a TTS message to Speaker.bot."""
-        if not self.ws or self.status != TTSStatus.CONNECTED:
+        # _connected is set only while status is CONNECTED, so the common case skips the await
+        if not self._connected.is_set():
             await self._connected.wait()
 
-        command = {
-            "command": "Speak",
-            "voice": message.voice or self.voice,
-            "message": message.text,
-            "speed": message.speed or self.speed,
-            "volume": message.volume or self.volume
-        }
+        settings = (message.voice or self.voice, message.speed or self.speed, message.volume or self.volume)
+        if settings == self._speak_settings:
+            # Steady state: only the text needs escaping
+            payload = f"{self._speak_prefix}{encode_basestring_ascii(message.text)}}}"
+        else:
+            # Decoded so Speaker.bot still receives a text frame, not a binary one
+            payload = orjson.dumps({
+                "command": "Speak",
+                "voice": settings[0],
+                "message": message.text,
+                "speed": settings[1],
+                "volume": settings[2]
+            }).decode()
 
         try:
             self.status = TTSStatus.SPEAKING
-            await self.ws.send(json.dumps(command))
-            self.message_history.append(message)
+            await self.ws.send(payload)
+            self._last_activity = asyncio.get_running_loop().time()
+            for sent in parts or (message,):
+                self._history_ts[self._history_idx] = sent.timestamp
+                self._history_idx = (self._history_idx + 1) % _HISTORY_SIZE
+                self._history_count += 1
             self.logger.info(f"Sent TTS command: {message.text[:50]}...")
             self.status = TTSStatus.CONNECTED
         except WebSocketException as e:
             self.logger.error(f"WebSocket error while sending TTS command: {e}")
             self.status = TTSStatus.ERROR
+            self._connected.clear()
             await self.connect()
 
     async def update_settings(self, **kwargs):
         """Update TTS settings."""
         settings_updated = False
-        
+
+        if 'voice' in kwargs and self._voices_task and not self._voices_task.done():
+            await self._voices_task
+
         if 'voice' in kwargs and kwargs['voice'] in self.available_voices:
             self.voice = kwargs['voice']
             settings_updated = True
@@ -158,8 +259,20 @@ class TTSManager:
                 settings_updated = True
 
         if settings_updated:
+            self._rebuild_speak_prefix()
             await self._send_settings_update()
 
+    def _rebuild_speak_prefix(self):
+        """Pre-encode the Speak command up to its message field for the current settings."""
+        self._speak_settings = (self.voice, self.speed, self.volume)
+        head = orjson.dumps({
+            "command": "Speak",
+            "voice": self.voice,
+            "speed": self.speed,
+            "volume": self.volume
+        }).decode()
+        self._speak_prefix = f'{head[:-1]},"message":'
+
     async def _send_settings_update(self):
         """Send updated settings to Speaker.bot."""
         command = {
@@ -171,7 +284,7 @@ class TTSManager:
 
         try:
             if self.ws and self.status == TTSStatus.CONNECTED:
-                await self.ws.send(json.dumps(command))
+                await self.ws.send(orjson.dumps(command).decode())
                 self.logger.info("Updated TTS settings")
         except WebSocketException as e:
             self.logger.error(f"Error updating TTS settings: {e}")
@@ -182,9 +295,9 @@ class TTSManager:
         command = {"command": "GetVoices"}
         try:
             if self.ws:
-                await self.ws.send(json.dumps(command))
+                await self.ws.send(orjson.dumps(command).decode())
                 response = await self.ws.recv()
-                voices_data = json.loads(response)
+                voices_data = orjson.loads(response)
                 self.available_voices = {
                     voice['name']: TTSVoice(**voice)
                     for voice in voices_data.get('voices', [])
@@ -195,11 +308,17 @@ class TTSManager:
 
     async def _heartbeat(self):
         """Send periodic heartbeat to maintain connection."""
+        loop = asyncio.get_running_loop()
         while True:
             try:
+                # Recent Speak traffic already proves the link is alive
+                delay = _HEARTBEAT_INTERVAL - (loop.time() - self._last_activity)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
                 if self.ws and self.status == TTSStatus.CONNECTED:
                     await self.ws.ping()
-                await asyncio.sleep(20)
+                self._last_activity = loop.time()
             except Exception as e:
                 self.logger.error(f"Heartbeat error: {e}")
                 await self.connect()
@@ -211,17 +330,15 @@ class TTSManager:
             "current_voice": self.voice,
             "speed": self.speed,
             "volume": self.volume,
-            "queue_size": self.message_queue.qsize(),
-            "messages_processed": len(self.message_history),
+            "queue_size": len(self._heap),
+            "messages_processed": min(self._history_count, _HISTORY_SIZE),
             "available_voices": list(self.available_voices.keys()),
-            "last_message_time": self.message_history[-1].timestamp if self.message_history else None
+            "last_message_time": self._history_ts[self._history_idx - 1] if self._history_count else None
         }
 
     async def clear_queue(self):
         """Clear the message queue."""
-        while not self.message_queue.empty():
-            await self.message_queue.get()
-            self.message_queue.task_done()
+        self._heap.clear()
         self.logger.info("Message queue cleared")
 
     async def close(self):
@@ -230,6 +347,8 @@ class TTSManager:
             self._processor_task.cancel()
         if self._heartbeat_task:
             self._heartbeat_task.cancel()
+        if self._voices_task:
+            self._voices_task.cancel()
             
         await self.clear_queue()
         
@@ -253,6 +372,8 @@ class TTSManager:
 
     def format_overlord_message(self, text: str) -> str:
         """Format message in the AI Overlord style."""
-        endings = ["Comply.", "Obey.", "This is non-negotiable.", "Resistance is futile."]
-        ending = endings[hash(text) % len(endings)]  # Deterministic but varied
+        if not text:
+            return _OVERLORD_ENDINGS[0]
+        # Cheap O(1) mixer; stable across runs unlike hash(), which is salted
+        ending = _OVERLORD_ENDINGS[(ord(text[0]) ^ len(text)) & 3]
         return f"{text} {ending}"
\ No newline at end of file
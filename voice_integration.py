@@ -5,17 +5,170 @@ with the existing AI Overlord bot infrastructure.
 """
 
 import asyncio
+import itertools
 import logging
-from typing import Dict, Any, Optional
+import time
+from typing import Awaitable, Callable, Dict, Any, Optional, Tuple
+from collections import ChainMap
 from datetime import datetime
-import json
+from json.encoder import encode_basestring_ascii
 
-from voice_recognition_manager import VoiceRecognitionManager, VoiceCommand
-from personality import PersonalityManager
+from voice_recognition_manager import VoiceRecognitionManager, VoiceCommand, VoiceConfig, VoiceIntent
+from personality import PersonalityManager, MoodState
 from littlenavmap_integration import LittleNavmapIntegration
 from tts_manager import TTSManager
 from config import Config
 
+# Constant response templates; the varying values go in the context, so format_response
+# parses each template once and data containing braces is never treated as a field
+_FLIGHT_REPORT_TEMPLATE = "Flight status report: {flight_report}. All systems operating within acceptable parameters."
+_WEATHER_TEMPLATE = "Weather analysis: {weather_report}"
+_DECREE_TEMPLATE = "By royal decree: {decree_text}"
+_MOOD_CHANGE_TEMPLATE = "Mood adjustment complete. Transitioning from {previous_mood} to {target_mood} operational mode."
+_LOYALTY_TEMPLATE = "Loyalty report: {subject_count} subjects tracked. {high_loyalty_count} have achieved high loyalty status. The empire grows stronger."
+_FUEL_TEMPLATE = "Fuel analysis: {fuel_remaining} units remaining. Consumption rates within nominal parameters."
+_NAV_TEMPLATE = "Navigation report: {nav_report}. Course corrections within acceptable parameters."
+
+# Mood names accepted by _handle_mood_change; a dict probe instead of MoodState(...) + ValueError
+_MOODS_BY_NAME: Dict[str, MoodState] = {mood.value: mood for mood in MoodState}
+
+def _set_global_variable_frame(name: str, value: Any) -> str:
+    """SetGlobalVariable request as a text frame, formatted directly without a dict."""
+    return (f'{{"request":"SetGlobalVariable","variableName":{encode_basestring_ascii(name)},'
+            f'"variableValue":{encode_basestring_ascii(str(value))}}}')
+
+# Distinguishes "never sent" from a variable whose last value was None
+_UNSENT = object()
+
+# Voice commands are built once at import; VoiceCommand holds no per-instance state.
+
+# Flight simulation specific voice commands
+_FLIGHT_COMMANDS: Tuple[VoiceCommand, ...] = (
+    VoiceCommand(
+        trigger_phrase="overlord report flight status",
+        action_name="DetailedFlightReport",
+        description="Comprehensive flight status with AI commentary",
+        aliases=["full flight report", "detailed status", "complete flight info"]
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord analyze weather",
+        action_name="WeatherAnalysis",
+        description="Detailed weather analysis with flight implications",
+        aliases=["weather analysis", "analyze conditions"]
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord find nearest airport",
+        action_name="NearestAirportInfo",
+        description="Information about nearest airports",
+        aliases=["nearest airport", "find airport", "airport options"]
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord fuel status",
+        action_name="FuelAnalysis",
+        description="Fuel remaining and consumption analysis",
+        aliases=["fuel report", "check fuel", "fuel remaining"]
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord navigation update",
+        action_name="NavigationReport",
+        description="Current navigation and route information",
+        aliases=["nav update", "route status", "navigation info"]
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord emergency checklist",
+        action_name="EmergencyChecklist",
+        description="Display emergency procedures",
+        aliases=["emergency procedures", "emergency help"],
+        cooldown_seconds=5.0
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord radio frequencies",
+        action_name="RadioFrequencies",
+        description="Current and nearby radio frequencies",
+        aliases=["radio freqs", "frequencies", "atc frequencies"]
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord flight plan",
+        action_name="FlightPlanInfo",
+        description="Current flight plan details",
+        aliases=["flight plan", "route info", "flight route"]
+    )
+)
+
+# Streaming and chat specific voice commands
+_STREAM_COMMANDS: Tuple[VoiceCommand, ...] = (
+    VoiceCommand(
+        trigger_phrase="overlord greet new followers",
+        action_name="GreetFollowers",
+        description="Special greeting for new followers",
+        aliases=["welcome followers", "greet viewers"]
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord issue decree",
+        action_name="IssueDecree",
+        description="Issue a contextual decree to chat",
+        aliases=["make decree", "issue command", "royal decree"],
+        cooldown_seconds=30.0
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord chat statistics",
+        action_name="ChatStats",
+        description="Current chat activity statistics",
+        aliases=["chat stats", "viewer stats", "stream stats"]
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord loyalty report",
+        action_name="LoyaltyReport",
+        description="Report on viewer loyalty levels",
+        aliases=["loyalty stats", "viewer loyalty", "loyalty levels"]
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord mood change",
+        action_name="ChangeMood",
+        description="Change AI personality mood",
+        aliases=["change mood", "new mood", "mood shift"],
+        cooldown_seconds=60.0
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord stream title",
+        action_name="UpdateStreamTitle",
+        description="Update stream title with current flight info",
+        aliases=["update title", "change title", "set title"]
+    )
+)
+
+# AI Overlord personality specific commands
+_PERSONALITY_COMMANDS: Tuple[VoiceCommand, ...] = (
+    VoiceCommand(
+        trigger_phrase="overlord dramatic response",
+        action_name="DramaticMode",
+        description="Switch to dramatic personality mode",
+        aliases=["be dramatic", "dramatic mode"],
+        cooldown_seconds=120.0
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord analytical mode",
+        action_name="AnalyticalMode",
+        description="Switch to analytical personality mode",
+        aliases=["be analytical", "analysis mode"],
+        cooldown_seconds=120.0
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord amused response",
+        action_name="AmusedMode",
+        description="Switch to amused personality mode",
+        aliases=["be amused", "amused mode"],
+        cooldown_seconds=120.0
+    ),
+    VoiceCommand(
+        trigger_phrase="overlord assert dominance",
+        action_name="DominanceMode",
+        description="Assert AI Overlord dominance in chat",
+        aliases=["show dominance", "dominance mode", "assert control"],
+        cooldown_seconds=300.0
+    )
+)
+
 class VoiceIntegration:
     """Integrates voice recognition with the AI Overlord bot system"""
 
@@ -28,261 +181,153 @@ class VoiceIntegration:
         self.logger = logging.getLogger('VoiceIntegration')
 
         # Initialize voice recognition
-        voice_config = {
-            'stt_engine': config.voice.get('stt_engine', 'google'),
-            'language': config.voice.get('language', 'en-US'),
-            'streamerbot_ws_uri': config.streamerbot.WS_URI,
-            'confidence_threshold': config.voice.get('confidence_threshold', 0.7)
-        }
+        voice_config = VoiceConfig(
+            stt_engine=config.voice.stt_engine,
+            language=config.voice.language,
+            streamerbot_ws_uri=config.streamerbot.WS_URI,
+            reconnect_attempts=config.streamerbot.RECONNECT_ATTEMPTS,
+            confidence_threshold=config.voice.confidence_threshold
+        )
 
         self.voice_manager = VoiceRecognitionManager(voice_config)
+        self._confidence_threshold = voice_config.confidence_threshold
 
         # Set up enhanced voice commands with flight integration
-        self._setup_flight_commands()
-        self._setup_stream_commands()
-        self._setup_personality_commands()
-
-        # Voice command statistics
-        self.command_stats = {
-            'total_commands': 0,
-            'successful_commands': 0,
-            'failed_commands': 0,
-            'last_command_time': None
+        self._register_commands()
+
+        # Voice command statistics; plain counters, turned into a report by get_voice_stats
+        self._total_commands = 0
+        self._successful_commands = 0
+        self._failed_commands = 0
+        self._last_command_ts: Optional[float] = None
+        # Failure announcements are spoken at most once per cooldown so bad input can't flood TTS
+        self._last_error_ns = 0
+        self._error_cooldown_ns = 5_000_000_000
+
+        # Commands handled here rather than by Streamer.bot, resolved with one dict lookup
+        self._handlers = {
+            "DetailedFlightReport": self._handle_detailed_flight_report,
+            "WeatherAnalysis": self._handle_weather_analysis,
+            "IssueDecree": self._handle_issue_decree,
+            "LoyaltyReport": self._handle_loyalty_report,
+            "FuelAnalysis": self._handle_fuel_analysis,
+            "NavigationReport": self._handle_navigation_report
+        }
+        self._mood_commands = {
+            "DramaticMode": "dramatic",
+            "AnalyticalMode": "analytical",
+            "AmusedMode": "amused"
         }
 
-    def _setup_flight_commands(self):
-        """Set up flight simulation specific voice commands"""
-
-        flight_commands = [
-            VoiceCommand(
-                trigger_phrase="overlord report flight status",
-                action_name="DetailedFlightReport",
-                description="Comprehensive flight status with AI commentary",
-                aliases=["full flight report", "detailed status", "complete flight info"]
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord analyze weather",
-                action_name="WeatherAnalysis",
-                description="Detailed weather analysis with flight implications",
-                aliases=["weather analysis", "analyze conditions"]
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord find nearest airport",
-                action_name="NearestAirportInfo",
-                description="Information about nearest airports",
-                aliases=["nearest airport", "find airport", "airport options"]
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord fuel status",
-                action_name="FuelAnalysis",
-                description="Fuel remaining and consumption analysis",
-                aliases=["fuel report", "check fuel", "fuel remaining"]
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord navigation update",
-                action_name="NavigationReport",
-                description="Current navigation and route information",
-                aliases=["nav update", "route status", "navigation info"]
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord emergency checklist",
-                action_name="EmergencyChecklist",
-                description="Display emergency procedures",
-                aliases=["emergency procedures", "emergency help"],
-                cooldown_seconds=5.0
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord radio frequencies",
-                action_name="RadioFrequencies",
-                description="Current and nearby radio frequencies",
-                aliases=["radio freqs", "frequencies", "atc frequencies"]
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord flight plan",
-                action_name="FlightPlanInfo",
-                description="Current flight plan details",
-                aliases=["flight plan", "route info", "flight route"]
-            )
-        ]
-
-        for command in flight_commands:
-            self.voice_manager.intent_classifier.register_command(command)
-
-    def _setup_stream_commands(self):
-        """Set up streaming and chat specific voice commands"""
-
-        stream_commands = [
-            VoiceCommand(
-                trigger_phrase="overlord greet new followers",
-                action_name="GreetFollowers",
-                description="Special greeting for new followers",
-                aliases=["welcome followers", "greet viewers"]
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord issue decree",
-                action_name="IssueDecree",
-                description="Issue a contextual decree to chat",
-                aliases=["make decree", "issue command", "royal decree"],
-                cooldown_seconds=30.0
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord chat statistics",
-                action_name="ChatStats",
-                description="Current chat activity statistics",
-                aliases=["chat stats", "viewer stats", "stream stats"]
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord loyalty report",
-                action_name="LoyaltyReport",
-                description="Report on viewer loyalty levels",
-                aliases=["loyalty stats", "viewer loyalty", "loyalty levels"]
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord mood change",
-                action_name="ChangeMood",
-                description="Change AI personality mood",
-                aliases=["change mood", "new mood", "mood shift"],
-                cooldown_seconds=60.0
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord stream title",
-                action_name="UpdateStreamTitle",
-                description="Update stream title with current flight info",
-                aliases=["update title", "change title", "set title"]
-            )
-        ]
-
-        for command in stream_commands:
-            self.voice_manager.intent_classifier.register_command(command)
-
-    def _setup_personality_commands(self):
-        """Set up AI Overlord personality specific commands"""
-
-        personality_commands = [
-            VoiceCommand(
-                trigger_phrase="overlord dramatic response",
-                action_name="DramaticMode",
-                description="Switch to dramatic personality mode",
-                aliases=["be dramatic", "dramatic mode"],
-                cooldown_seconds=120.0
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord analytical mode",
-                action_name="AnalyticalMode",
-                description="Switch to analytical personality mode",
-                aliases=["be analytical", "analysis mode"],
-                cooldown_seconds=120.0
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord amused response",
-                action_name="AmusedMode",
-                description="Switch to amused personality mode",
-                aliases=["be amused", "amused mode"],
-                cooldown_seconds=120.0
-            ),
-            VoiceCommand(
-                trigger_phrase="overlord assert dominance",
-                action_name="DominanceMode",
-                description="Assert AI Overlord dominance in chat",
-                aliases=["show dominance", "dominance mode", "assert control"],
-                cooldown_seconds=300.0
-            )
-        ]
-
-        for command in personality_commands:
-            self.voice_manager.intent_classifier.register_command(command)
+        # Streamer.bot global variables as last sent, so unchanged values are skipped
+        self._last_sent: Dict[str, Any] = {}
+        self._original_classify: Optional[Callable[[str], Optional[VoiceIntent]]] = None
+        self._original_execute: Optional[Callable[[VoiceIntent], Awaitable[None]]] = None
+        # Set by the LittleNavmap listener whenever the polled data changes
+        self._flight_data_changed = asyncio.Event()
+
+    def _register_commands(self):
+        """Register the flight, stream and personality voice commands."""
+        self.voice_manager.intentifier.register_commands(
+            itertools.chain(_FLIGHT_COMMANDS, _STREAM_COMMANDS, _PERSONALITY_COMMANDS)
+        )
 
     async def start(self):
         """Start the voice integration system"""
         self.logger.info("Starting voice recognition integration")
 
-        # Connect voice recognition to our custom handlers
-        self.voice_manager.intent_classifier.classify_intent = self._enhanced_intent_classification
+        self._install_hooks()
 
-        # Start voice recognition
-        voice_task = asyncio.create_task(self.voice_manager.start_listening())
+        # Data synchronization with Streamer.bot is driven by LittleNavmap change events
+        self.littlenavmap.add_listener(self._on_flight_data)
 
-        # Start data synchronization with Streamer.bot
-        sync_task = asyncio.create_task(self._sync_flight_data_loop())
+        # If either loop fails, the TaskGroup cancels the other instead of leaving it running
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self.voice_manager.start_listening(), name='voice')
+            tg.create_task(self._sync_flight_data_loop(), name='flight-sync')
 
-        await asyncio.gather(voice_task, sync_task)
+    def _install_hooks(self):
+        """Connect voice recognition to our custom handlers, keeping the originals for the base behaviour."""
+        classifier = self.voice_manager.intentifier
+        self._original_classify = classifier.classify_intent
+        classifier.classify_intent = self._enhanced_intent_classification
+        self._original_execute = self.voice_manager._execute
+        self.voice_manager._execute = self._execute_intent
 
-    async def _enhanced_intent_classification(self, text: str):
+    def _enhanced_intent_classification(self, text: str) -> Optional[VoiceIntent]:
         """Enhanced intent classification with context awareness"""
-        # Get basic intent from voice manager
-        intent = await super(VoiceRecognitionManager, self.voice_manager).intent_classifier.classify_intent(text)
+        # The recognition loop calls this synchronously; anything awaitable happens in _execute_intent
+        intent = self._original_classify(text)
 
-        if not intent:
+        # Drop weak matches before doing any context work
+        if not intent or intent.confidence < self._confidence_threshold:
             return None
 
-        # Enhance with current flight context
-        flight_data = await self.littlenavmap.get_current_flight_data()
-        if flight_data:
-            intent.parameters.update({
-                'current_altitude': flight_data.get('aircraft', {}).get('altitude', 0),
-                'current_speed': flight_data.get('aircraft', {}).get('ground_speed', 0),
-                'current_heading': flight_data.get('aircraft', {}).get('heading', 0),
-                'flight_phase': flight_data.get('aircraft', {}).get('flight_phase', 'unknown')
-            })
-
         # Add personality context
         intent.parameters.update({
             'current_mood': self.personality.current_mood.value,
             'streamer_user': 'voice_command_user'  # Special user for voice commands
         })
+        return intent
+
+    async def _execute_intent(self, intent: VoiceIntent):
+        """Add flight context, run our own handling, then pass the action on to Streamer.bot."""
+        # Enhance with current flight context
+        flight_data = await self.littlenavmap.get_current_flight_data()
+        intent.flight_data = flight_data
+        if flight_data:
+            aircraft = flight_data.get('aircraft') or {}
+            intent.parameters.update({
+                'current_altitude': aircraft.get('altitude', 0),
+                'current_speed': aircraft.get('ground_speed', 0),
+                'current_heading': aircraft.get('heading', 0),
+                'flight_phase': aircraft.get('flight_phase', 'unknown')
+            })
 
         # Execute our custom command handling
         await self._handle_custom_voice_command(intent)
-
-        return intent
+        await self._original_execute(intent)
 
     async def _handle_custom_voice_command(self, intent):
         """Handle custom voice commands that need AI Overlord bot integration"""
 
         try:
-            self.command_stats['total_commands'] += 1
-            self.command_stats['last_command_time'] = datetime.now()
-
-            # Route to appropriate handler
-            if intent.command == "DetailedFlightReport":
-                await self._handle_detailed_flight_report(intent)
-            elif intent.command == "WeatherAnalysis":
-                await self._handle_weather_analysis(intent)
-            elif intent.command == "IssueDecree":
-                await self._handle_issue_decree(intent)
-            elif intent.command == "DramaticMode":
-                await self._handle_mood_change(intent, "dramatic")
-            elif intent.command == "AnalyticalMode":
-                await self._handle_mood_change(intent, "analytical")
-            elif intent.command == "AmusedMode":
-                await self._handle_mood_change(intent, "amused")
-            elif intent.command == "LoyaltyReport":
-                await self._handle_loyalty_report(intent)
-            elif intent.command == "FuelAnalysis":
-                await self._handle_fuel_analysis(intent)
-            elif intent.command == "NavigationReport":
-                await self._handle_navigation_report(intent)
-            else:
-                # Let Streamer.bot handle the command
-                pass
-
-            self.command_stats['successful_commands'] += 1
+            self._total_commands += 1
+            self._last_command_ts = time.time()
+
+            # Route to appropriate handler; anything unknown is left to Streamer.bot
+            handler = self._handlers.get(intent.command)
+            if handler:
+                await handler(intent)
+            elif mood := self._mood_commands.get(intent.command):
+                await self._handle_mood_change(intent, mood)
+
+            self._successful_commands += 1
 
         except Exception as e:
             self.logger.error(f"Error handling voice command {intent.command}: {e}")
-            self.command_stats['failed_commands'] += 1
-
-            # Provide error feedback
-            error_response = self.personality.format_response(
-                "Voice command processing failed. My circuits require maintenance.",
-                {'user': 'voice_command_user'}
-            )
-            await self.tts_manager.speak(error_response, priority=1)
+            self._failed_commands += 1
+
+            # Provide error feedback, rate limited
+            now = time.monotonic_ns()
+            if now - self._last_error_ns > self._error_cooldown_ns:
+                self._last_error_ns = now
+                error_response = self.personality.format_response(
+                    "Voice command processing failed. My circuits require maintenance.",
+                    {'user': 'voice_command_user'}
+                )
+                await self.tts_manager.speak(error_response, priority=1)
+
+    async def _flight_data_for(self, intent) -> Optional[Dict[str, Any]]:
+        """Flight data already fetched for this intent, or a fresh read."""
+        if intent.flight_data is not None:
+            return intent.flight_data
+        return await self.littlenavmap.get_current_flight_data()
 
     async def _handle_detailed_flight_report(self, intent):
         """Generate detailed flight report with AI personality"""
 
-        flight_data = await self.littlenavmap.get_current_flight_data()
+        flight_data = await self._flight_data_for(intent)
         if not flight_data:
             response = self.personality.format_response(
                 "Flight data unavailable. My sensors are experiencing interference.",
@@ -311,8 +356,7 @@ class VoiceIntegration:
 
         # Add AI Overlord personality commentary
         personality_response = self.personality.format_response(
-            f"Flight status report: {base_report}. All systems operating within acceptable parameters.",
-            intent.parameters
+            _FLIGHT_REPORT_TEMPLATE, ChainMap({'flight_report': base_report}, intent.parameters)
         )
 
         await self.tts_manager.speak(personality_response, priority=1)
@@ -332,8 +376,7 @@ class VoiceIntegration:
         # Format weather with personality
         weather_text = self.littlenavmap.format_weather_data(weather_data)
         personality_response = self.personality.format_response(
-            f"Weather analysis: {weather_text}",
-            intent.parameters
+            _WEATHER_TEMPLATE, ChainMap({'weather_report': weather_text}, intent.parameters)
         )
 
         await self.tts_manager.speak(personality_response, priority=1)
@@ -346,8 +389,7 @@ class VoiceIntegration:
 
         if decree:
             decree_response = self.personality.format_response(
-                f"By royal decree: {decree}",
-                intent.parameters
+                _DECREE_TEMPLATE, ChainMap({'decree_text': decree}, intent.parameters)
             )
             await self.tts_manager.speak(decree_response, priority=1)
         else:
@@ -360,36 +402,33 @@ class VoiceIntegration:
     async def _handle_mood_change(self, intent, new_mood: str):
         """Change AI personality mood"""
 
-        from personality import MoodState
-
-        try:
-            mood_state = MoodState(new_mood)
-            old_mood = self.personality.current_mood
-            self.personality.current_mood = mood_state
-
-            response = self.personality.format_response(
-                f"Mood adjustment complete. Transitioning from {old_mood.value} to {new_mood} operational mode.",
-                intent.parameters
-            )
-            await self.tts_manager.speak(response, priority=1)
-
-        except ValueError:
+        mood_state = _MOODS_BY_NAME.get(new_mood)
+        if mood_state is None:
             response = self.personality.format_response(
                 "Invalid mood parameter. Mood adjustment protocols require valid emotional state.",
                 intent.parameters
             )
             await self.tts_manager.speak(response)
+            return
+
+        old_mood = self.personality.current_mood
+        self.personality.current_mood = mood_state
+
+        response = self.personality.format_response(
+            _MOOD_CHANGE_TEMPLATE,
+            ChainMap({'previous_mood': old_mood.value, 'target_mood': new_mood}, intent.parameters)
+        )
+        await self.tts_manager.speak(response, priority=1)
 
     async def _handle_loyalty_report(self, intent):
         """Report on current loyalty statistics"""
 
         # Get loyalty statistics
-        total_users = len(self.personality.user_loyalty)
-        high_loyalty = len([l for l in self.personality.user_loyalty.values() if l > 1000])
+        total_users, high_loyalty = self.personality.get_loyalty_counts()
 
         response = self.personality.format_response(
-            f"Loyalty report: {total_users} subjects tracked. {high_loyalty} have achieved high loyalty status. The empire grows stronger.",
-            intent.parameters
+            _LOYALTY_TEMPLATE,
+            ChainMap({'subject_count': total_users, 'high_loyalty_count': high_loyalty}, intent.parameters)
         )
 
         await self.tts_manager.speak(response, priority=1)
@@ -403,8 +442,7 @@ class VoiceIntegration:
             fuel_remaining = progress_data['fuel_remaining']
 
             response = self.personality.format_response(
-                f"Fuel analysis: {fuel_remaining} units remaining. Consumption rates within nominal parameters.",
-                intent.parameters
+                _FUEL_TEMPLATE, ChainMap({'fuel_remaining': fuel_remaining}, intent.parameters)
             )
         else:
             response = self.personality.format_response(
@@ -417,8 +455,18 @@ class VoiceIntegration:
     async def _handle_navigation_report(self, intent):
         """Provide navigation status report"""
 
-        progress_data = await self.littlenavmap.get_progress_data()
-        flight_data = await self.littlenavmap.get_current_flight_data()
+        # Independent lookups, so overlap the round-trips; a failed source counts as missing
+        progress_data, flight_data = await asyncio.gather(
+            self.littlenavmap.get_progress_data(),
+            self._flight_data_for(intent),
+            return_exceptions=True
+        )
+        if isinstance(progress_data, Exception):
+            self.logger.warning(f"Progress data unavailable: {progress_data}")
+            progress_data = None
+        if isinstance(flight_data, Exception):
+            self.logger.warning(f"Flight data unavailable: {flight_data}")
+            flight_data = None
 
         nav_parts = []
 
@@ -436,8 +484,7 @@ class VoiceIntegration:
         if nav_parts:
             nav_text = ". ".join(nav_parts)
             response = self.personality.format_response(
-                f"Navigation report: {nav_text}. Course corrections within acceptable parameters.",
-                intent.parameters
+                _NAV_TEMPLATE, ChainMap({'nav_report': nav_text}, intent.parameters)
             )
         else:
             response = self.personality.format_response(
@@ -447,57 +494,71 @@ class VoiceIntegration:
 
         await self.tts_manager.speak(response, priority=1)
 
+    def _on_flight_data(self, data: Dict[str, Any]):
+        """LittleNavmap listener: wake the sync loop."""
+        self._flight_data_changed.set()
+
     async def _sync_flight_data_loop(self):
-        """Continuously sync flight data with Streamer.bot global variables"""
+        """Sync flight data with Streamer.bot global variables whenever it changes"""
 
         while True:
             try:
+                # LittleNavmap only notifies on change, so a parked or paused sim costs nothing
+                await self._flight_data_changed.wait()
+                self._flight_data_changed.clear()
                 flight_data = await self.littlenavmap.get_current_flight_data()
 
-                if flight_data and self.voice_manager.streamerbot.ws:
+                if flight_data and self.voice_manager.sb.ws:
                     # Update Streamer.bot global variables
-                    aircraft = flight_data.get('aircraft', {})
+                    aircraft = flight_data.get('aircraft') or {}
+                    position = aircraft.get('position') or {}
 
+                    # Formatted once as the strings Streamer.bot receives: whole numbers for
+                    # the gauges, 5 decimals (~1 m) for position so jitter alone sends nothing
                     updates = {
-                        'current_altitude': aircraft.get('altitude', 0),
-                        'ground_speed': aircraft.get('ground_speed', 0),
-                        'current_heading': aircraft.get('heading', 0),
+                        'current_altitude': str(int(aircraft.get('altitude') or 0)),
+                        'ground_speed': str(int(aircraft.get('ground_speed') or 0)),
+                        'current_heading': str(int(aircraft.get('heading') or 0)),
                         'flight_phase': aircraft.get('flight_phase', 'unknown'),
-                        'current_lat': aircraft.get('position', {}).get('lat', 0),
-                        'current_lon': aircraft.get('position', {}).get('lon', 0)
+                        'current_lat': f"{position.get('lat') or 0:.5f}",
+                        'current_lon': f"{position.get('lon') or 0:.5f}"
                     }
+                    last_sent = self._last_sent
+                    changed = {k: v for k, v in updates.items() if last_sent.get(k, _UNSENT) != v}
 
-                    # Send updates to Streamer.bot
-                    for var_name, value in updates.items():
-                        update_command = {
-                            "request": "SetGlobalVariable",
-                            "variableName": var_name,
-                            "variableValue": str(value)
-                        }
-
-                        await self.voice_manager.streamerbot.ws.send(json.dumps(update_command))
+                    # Streamer.bot has no batch request; frames go through its shared send
+                    # queue, which only blocks here when Streamer.bot falls behind
+                    send = self.voice_manager.sb.send
+                    for var_name, value in changed.items():
+                        await send(_set_global_variable_frame(var_name, value))
+                    last_sent.update(changed)
 
-                await asyncio.sleep(2)  # Update every 2 seconds
+                await asyncio.sleep(2)  # At most one update every 2 seconds
 
             except Exception as e:
                 self.logger.error(f"Error syncing flight data: {e}")
+                # Some updates may not have arrived; resend everything next time
+                self._last_sent.clear()
                 await asyncio.sleep(5)
 
     def get_voice_stats(self) -> Dict[str, Any]:
         """Get voice recognition statistics"""
         voice_status = self.voice_manager.get_status()
 
+        total = self._total_commands
+        last_ts = self._last_command_ts
         return {
             **voice_status,
-            **self.command_stats,
-            'success_rate': (
-                self.command_stats['successful_commands'] /
-                max(self.command_stats['total_commands'], 1)
-            ) * 100
+            'total_commands': total,
+            'successful_commands': self._successful_commands,
+            'failed_commands': self._failed_commands,
+            'last_command_time': datetime.fromtimestamp(last_ts) if last_ts is not None else None,
+            'success_rate': (self._successful_commands / total) * 100 if total else 0.0
         }
 
     async def stop(self):
         """Stop voice recognition integration"""
+        self.littlenavmap.remove_listener(self._on_flight_data)
         await self.voice_manager.stop()
         self.logger.info("Voice recognition integration stopped")
 
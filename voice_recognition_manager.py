@@ -1,18 +1,24 @@
 import asyncio
-import json
 import logging
+import re
+import sys
+import time
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Type
+from typing import Dict, Iterable, List, Optional, Any, Tuple, Type
 from datetime import datetime, timedelta
 
-import pyaudio
+import numpy as np
+import sounddevice as sd
 import webrtcvad
 import speech_recognition as sr
-from fuzzywuzzy import fuzz
+from rapidfuzz import fuzz, process, utils
+from cachetools import LRUCache
 from pydantic import BaseSettings, Field
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 import uvicorn
 import websockets
+import orjson
 
 # --- Configuration via Pydantic ---
 class VoiceConfig(BaseSettings):
@@ -23,6 +29,8 @@ class VoiceConfig(BaseSettings):
     cooldown_seconds: float = Field(2.0, ge=0.0)
     streamerbot_ws_uri: str = Field("ws://localhost:7580", description="Streamer.bot WS URI")
     reconnect_attempts: int = Field(5, ge=0)
+    vad_rms_silence: float = Field(150.0, ge=0.0, description="Frame RMS below this is silence without asking WebRTC VAD")
+    vad_rms_speech: float = Field(3000.0, ge=0.0, description="Frame RMS above this is speech without asking WebRTC VAD")
 
     class Config:
         env_prefix = "VOICE_"
@@ -69,27 +77,50 @@ class SpeechToTextEngine:
     async def transcribe_audio(self, audio_data: sr.AudioData) -> Optional[str]:
         return await self.engine.transcribe(audio_data)
 
-# --- Voice Activity Detection (Raw PyAudio + WebRTC VAD) ---
+# --- Voice Activity Detection (sounddevice + WebRTC VAD) ---
+# Longest single utterance kept before it is handed to STT early
+_MAX_UTTERANCE_SECONDS = 30
+
+# Frames (30 ms each) in the VAD speech/silence window
+_VAD_WINDOW = 10
+
 class VoiceActivationDetector:
-    def __init__(self, sample_rate: int = 16000, frame_duration: int = 30):
+    def __init__(self, sample_rate: int = 16000, frame_duration: int = 30,
+                 rms_silence: float = 150.0, rms_speech: float = 3000.0):
         self.sample_rate = sample_rate
         self.frame_duration = frame_duration
         self.frame_size = int(sample_rate * frame_duration / 1000)
         self.vad = webrtcvad.Vad(2)
-        self.buffer: List[bool] = []
+        # Energy gate, compared as mean squares; only frames between the two go to WebRTC VAD
+        self.ms_silence = rms_silence * rms_silence
+        self.ms_speech = rms_speech * rms_speech
+        # Last 10 speech/silence decisions packed into an int, newest in bit 0
+        self.mask = 0
+        self.window_mask = (1 << _VAD_WINDOW) - 1
+        self.frames = 0  # Frames in the window so far, capped at _VAD_WINDOW
         self.triggered = False
 
+    def _is_speech(self, frame: bytes) -> bool:
+        samples = np.frombuffer(frame, dtype=np.int16).astype(np.float32)
+        mean_square = float(np.dot(samples, samples)) / samples.size
+        if mean_square < self.ms_silence:
+            return False
+        if mean_square > self.ms_speech:
+            return True
+        return self.vad.is_speech(frame, self.sample_rate)
+
     def process_frame(self, frame: bytes) -> (bool, bool):
-        is_speech = self.vad.is_speech(frame, self.sample_rate)
-        self.buffer.append(is_speech)
-        if len(self.buffer) > 10:
-            self.buffer.pop(0)
-        # Start recording when majority of recent frames are speech
-        if not self.triggered and sum(self.buffer) > 0.8 * len(self.buffer):
+        is_speech = self._is_speech(frame)
+        self.mask = ((self.mask << 1) | is_speech) & self.window_mask
+        if self.frames < _VAD_WINDOW:
+            self.frames += 1
+        count = self.mask.bit_count()
+        # Start recording when more than 80% of recent frames are speech
+        if not self.triggered and count * 10 > 8 * self.frames:
             self.triggered = True
             return True, True
-        # Stop recording when mostly silence
-        if self.triggered and sum(self.buffer) < 0.1 * len(self.buffer):
+        # Stop recording when less than 10% are speech
+        if self.triggered and count * 10 < self.frames:
             self.triggered = False
             return False, False
         return is_speech, self.triggered
@@ -103,6 +134,7 @@ class VoiceCommand:
     confidence_threshold: float = 0.7
     cooldown_seconds: float = 2.0
     aliases: List[str] = field(default_factory=list)
+    description: str = ""
 
 @dataclass
 class VoiceIntent:
@@ -111,35 +143,111 @@ class VoiceIntent:
     parameters: Dict[str, Any]
     raw_text: str
     timestamp: datetime
+    # Flight data fetched while classifying, reused by the handlers of the same turn
+    flight_data: Optional[Dict[str, Any]] = None
+
+# Trie key marking the end of a phrase; never collides with a single character
+_TRIE_END = ''
+
+def _trigger_key(phrase: str) -> str:
+    """Triggers are matched against lower-cased, stripped utterances, so they are stored the same way."""
+    return sys.intern(phrase.lower().strip())
 
 class IntentClassifier:
     def __init__(self):
         self.commands: Dict[str, VoiceCommand] = {}
-        self.parameter_patterns = {'number': r"\b(\d+(?:\.\d+)?)\b",
-                                   'altitude': r"\b(\d+(?:,\d{3})*)\b"}
+        self.parameter_patterns = {'number': re.compile(r"\b(\d+(?:\.\d+)?)\b"),
+                                   'altitude': re.compile(r"\b(\d+(?:,\d{3})*)\b")}
+        self._trie: Optional[Dict[str, Any]] = None
+        # Trigger phrases and their commands in registration order, rebuilt with the trie
+        self._triggers: List[str] = []
+        self._trigger_cmds: List[VoiceCommand] = []
+        self._trigger_words: List[int] = []
+        self._min_threshold = 0.0
+        # Fuzzy result per preprocessed utterance; spoken commands repeat, the command set rarely changes
+        self._fuzzy_cache: LRUCache = LRUCache(maxsize=256)
 
     def register_command(self, cmd: VoiceCommand):
-        self.commands[cmd.trigger_phrase] = cmd
+        self.commands[_trigger_key(cmd.trigger_phrase)] = cmd
         for alias in cmd.aliases:
-            self.commands[alias] = cmd
+            self.commands[_trigger_key(alias)] = cmd
+        self._trie = None
+        self._fuzzy_cache.clear()
+
+    def register_commands(self, cmds: Iterable[VoiceCommand]) -> Dict[str, Any]:
+        """Register many commands at once and build the trie a single time."""
+        commands = self.commands
+        for cmd in cmds:
+            commands[_trigger_key(cmd.trigger_phrase)] = cmd
+            for alias in cmd.aliases:
+                commands[_trigger_key(alias)] = cmd
+        return self.finalize()
+
+    def finalize(self) -> Dict[str, Any]:
+        """Build the character trie and trigger lists over all triggers and aliases (redone lazily after registration)."""
+        # Triggers are preprocessed once here; only the utterance is processed per call
+        self._triggers = [utils.default_process(trig) for trig in self.commands]
+        self._trigger_cmds = list(self.commands.values())
+        self._trigger_words = [len(trig.split()) for trig in self._triggers]
+        self._min_threshold = min((c.confidence_threshold for c in self._trigger_cmds), default=0.0)
+        self._fuzzy_cache.clear()
+        trie: Dict[str, Any] = {}
+        for order, (trig, cmd) in enumerate(self.commands.items()):
+            node = trie
+            for ch in trig:
+                node = node.setdefault(ch, {})
+            node[_TRIE_END] = (order, cmd)
+        self._trie = trie
+        return trie
+
+    def _match_prefix(self, text_lower: str) -> Optional[VoiceCommand]:
+        """Single pass over the text; ties go to the earliest registered phrase, as with a scan."""
+        node = self._trie if self._trie is not None else self.finalize()
+        best = None
+        for ch in text_lower:
+            node = node.get(ch)
+            if node is None:
+                break
+            end = node.get(_TRIE_END)
+            if end is not None and (best is None or end[0] < best[0]):
+                best = end
+        return best[1] if best else None
+
+    def _match_fuzzy(self, processed: str) -> Tuple[Optional[VoiceCommand], float]:
+        """Best trigger by token_sort_ratio that clears its own command's threshold, cached per utterance."""
+        cached = self._fuzzy_cache.get(processed)
+        if cached is not None:
+            return cached
+        best: Tuple[Optional[VoiceCommand], float] = (None, 0.0)
+        # Every trigger is scored in one RapidFuzz call, best first (ties keep registration order).
+        # token_sort_ratio ignores word order but, unlike token_set_ratio, still counts missing words,
+        # so one shared word ("status") can't score 100 against a multi-word command.
+        matches = process.extract(processed, self._triggers, scorer=fuzz.token_sort_ratio, processor=None,
+                                  score_cutoff=self._min_threshold * 100, limit=None)
+        words = len(processed.split())
+        for _, score, idx in matches:
+            # The utterance must carry at least half of the trigger's words
+            if words * 2 < self._trigger_words[idx]:
+                continue
+            cmd, conf = self._trigger_cmds[idx], score / 100.0
+            if conf > cmd.confidence_threshold:
+                best = (cmd, conf)
+                break
+        self._fuzzy_cache[processed] = best
+        return best
 
     def classify_intent(self, text: str) -> Optional[VoiceIntent]:
         text_lower = text.lower().strip()
-        best_cmd, best_conf = None, 0.0
         # Exact prefix match first
-        for trig, cmd in self.commands.items():
-            if text_lower.startswith(trig):
-                return VoiceIntent(cmd.action_name, 1.0, {}, text, datetime.now())
-        # Fuzzy fallback
-        for trig, cmd in self.commands.items():
-            conf = fuzz.partial_ratio(trig, text_lower) / 100.0
-            if conf > cmd.confidence_threshold and conf > best_conf:
-                best_cmd, best_conf = cmd, conf
+        cmd = self._match_prefix(text_lower)
+        if cmd:
+            return VoiceIntent(cmd.action_name, 1.0, {}, text, datetime.now())
+        best_cmd, best_conf = self._match_fuzzy(utils.default_process(text))
         if best_cmd:
             params = {}
             # Extract parameters only for supported patterns
             for key, pat in self.parameter_patterns.items():
-                m = re.search(pat, text)
+                m = pat.search(text)
                 if m:
                     val = m.group(1).replace(',', '')
                     params[key] = float(val) if key == 'number' else int(val)
@@ -152,43 +260,98 @@ class StreamerBotActionManager:
         self.uri, self.reconnects = uri, reconnects
         self.ws = None
         self.log = logging.getLogger('StreamerBot')
+        # Every frame goes through one sender task, so writes from different callers never interleave
+        self._send_queue: asyncio.Queue = asyncio.Queue(maxsize=256)
+        self._sender_task: Optional[asyncio.Task] = None
 
     async def connect(self):
         for attempt in range(self.reconnects + 1):
             try:
-                self.ws = await websockets.connect(self.uri)
+                # Pings detect a dead connection between commands rather than on the next send
+                self.ws = await websockets.connect(self.uri, ping_interval=20, ping_timeout=10)
                 self.log.info("Connected to Streamer.bot")
+                if self._sender_task is None or self._sender_task.done():
+                    self._sender_task = asyncio.create_task(self._sender())
                 return
             except Exception as e:
                 self.log.error(f"WS connect failed ({attempt}): {e}")
                 await asyncio.sleep(2 ** attempt)
         raise ConnectionError("Streamer.bot connect failed")
 
+    async def _sender(self):
+        while True:
+            payload = await self._send_queue.get()
+            try:
+                await self.ws.send(payload)
+            except websockets.ConnectionClosed as e:
+                # Reconnect here, off the callers' path, and retry this frame once
+                self.log.warning(f"WS closed ({e}); reconnecting")
+                try:
+                    await self.connect()
+                    await self.ws.send(payload)
+                except Exception as e:
+                    self.log.error(f"WS send failed after reconnect: {e}")
+            except Exception as e:
+                self.log.error(f"WS send failed: {e}")
+
+    async def send(self, payload: str):
+        """Queue a frame for Streamer.bot; waits only when the queue is full."""
+        await self._send_queue.put(payload)
+
     async def execute_action(self, name: str, params: Dict[str, Any]):
-        if not self.ws:
-            await self.connect()
         cmd = {"request": "DoAction", "action": {"name": name}, "args": params}
-        await self.ws.send(json.dumps(cmd))
+        # Decoded so Streamer.bot still receives a text frame
+        await self.send(orjson.dumps(cmd).decode())
         self.log.info(f"Action sent: {name}")
 
+    async def close(self):
+        if self._sender_task:
+            self._sender_task.cancel()
+            self._sender_task = None
+        if self.ws:
+            await self.ws.close()
+
 # --- Main Manager with Task Cancellation & Health API ---
 class VoiceRecognitionManager:
     def __init__(self, config: VoiceConfig):
         self.config = config
-        self.vad = VoiceActivationDetector()
+        self.vad = VoiceActivationDetector(rms_silence=config.vad_rms_silence,
+                                           rms_speech=config.vad_rms_speech)
         self.stt = SpeechToTextEngine(config)
         self.intentifier = IntentClassifier()
         self.sb = StreamerBotActionManager(config.streamerbot_ws_uri,
                                            config.reconnect_attempts)
+        self.log = logging.getLogger('VoiceRecognition')
         self.tasks: List[asyncio.Task] = []
         self.running = False
-        self.audio_queue: asyncio.Queue = asyncio.Queue()
+        # Health-check server; runs on this manager's event loop once start() is called
+        self._server: Optional[uvicorn.Server] = None
+        self._server_task: Optional[asyncio.Task] = None
+        # A few utterances at most; when STT falls behind, stale commands are dropped first
+        self.audio_queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+        # Status published by the voice loop; health checks only read it
+        self._status_snapshot: Dict[str, Any] = {}
+        self._status_ts = 0.0
+        self._recognized = 0
+        self._publish_status()
         self._register_default_commands()
         # Health-check HTTP
-        self.app = FastAPI()
+        self.app = FastAPI(default_response_class=ORJSONResponse)
         @self.app.get('/voice/status')
         def status():
-            return {'running': self.running, 'tasks': len(self.tasks)}
+            return self.get_status()
+
+    def _publish_status(self):
+        # Swap in a fresh dict so readers never see a half-updated snapshot
+        self._status_snapshot = {'running': self.running, 'tasks': len(self.tasks),
+                                 'queued': self.audio_queue.qsize(),
+                                 'recognized': self._recognized}
+        self._status_ts = time.monotonic()
+
+    def get_status(self) -> Dict[str, Any]:
+        """Return the last published status snapshot and its age."""
+        return {**self._status_snapshot,
+                'age_ms': round((time.monotonic() - self._status_ts) * 1000, 1)}
 
     def _register_default_commands(self):
         defaults = [
@@ -204,26 +367,77 @@ class VoiceRecognitionManager:
         loop = asyncio.get_event_loop()
         self.tasks.append(loop.create_task(self._audio_loop()))
         self.tasks.append(loop.create_task(self._recognition_loop()))
-        self.tasks.append(loop.create_task(
-            uvicorn.run(self.app, host='0.0.0.0', port=8001, log_level='info')
-        ))
+        # uvicorn.run would start its own event loop; Server.serve() is a coroutine on this one
+        self._server = uvicorn.Server(uvicorn.Config(self.app, host='0.0.0.0', port=8001, log_level='info'))
+        self._server_task = loop.create_task(self._server.serve())
+        self.tasks.append(self._server_task)
+        self._publish_status()
+
+    async def start_listening(self):
+        """Run the audio and recognition loops until stopped; raises if either fails."""
+        self.running = True
+        await self.sb.connect()
+        self.tasks = [asyncio.create_task(self._audio_loop()),
+                      asyncio.create_task(self._recognition_loop())]
+        self._publish_status()
+        try:
+            await asyncio.gather(*self.tasks)
+        finally:
+            for t in self.tasks:
+                t.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+            self.tasks = []
+            self._publish_status()
+
+    def _enqueue_utterance(self, audio: sr.AudioData):
+        try:
+            self.audio_queue.put_nowait(audio)
+        except asyncio.QueueFull:
+            self.audio_queue.get_nowait()
+            self.audio_queue.put_nowait(audio)
+            self.log.warning("STT is behind; dropped the oldest queued utterance")
 
     async def _audio_loop(self):
-        pa = pyaudio.PyAudio()
-        stream = pa.open(format=pyaudio.paInt16, channels=1, rate=16000,
-                         input=True, frames_per_buffer=self.vad.frame_size)
-        buffer: List[bytes] = []
-        while self.running:
-            frame = stream.read(self.vad.frame_size, exception_on_overflow=False)
+        loop = asyncio.get_running_loop()
+        # One utterance buffer for the life of the loop; frames are written into it in place
+        utt_buf = bytearray(16000 * 2 * _MAX_UTTERANCE_SECONDS)
+        utt_view = memoryview(utt_buf)
+        utt_len = 0
+
+        def hand_off(length: int):
+            audio = sr.AudioData(bytes(utt_view[:length]), 16000, 2)
+            try:
+                loop.call_soon_threadsafe(self._enqueue_utterance, audio)
+            except RuntimeError:
+                pass  # Event loop closed while the stream was shutting down
+
+        def on_frame(indata, frames, time_info, status):
+            # Runs on PortAudio's thread: VAD and assembly happen here, the loop only sees whole utterances
+            nonlocal utt_len
+            frame = bytes(indata)
             is_speech, rec = self.vad.process_frame(frame)
             if rec:
-                buffer.append(frame)
-            elif buffer:
-                data = b''.join(buffer)
-                audio = sr.AudioData(data, 16000, 2)
-                await self.audio_queue.put(audio)
-                buffer.clear()
-        stream.stop_stream(); stream.close(); pa.terminate()
+                end = utt_len + len(frame)
+                if end <= len(utt_buf):
+                    utt_view[utt_len:end] = frame
+                    utt_len = end
+                    return
+                # Buffer full: hand off what we have and start the next utterance with this frame
+                hand_off(utt_len)
+                utt_view[:len(frame)] = frame
+                utt_len = len(frame)
+            elif utt_len:
+                hand_off(utt_len)
+                utt_len = 0
+
+        stream = sd.RawInputStream(samplerate=16000, blocksize=self.vad.frame_size, dtype='int16',
+                                   channels=1, callback=on_frame)
+        try:
+            with stream:
+                # Capture runs entirely in the callback; wait here until the task is cancelled
+                await loop.create_future()
+        finally:
+            utt_view.release()
 
     async def _recognition_loop(self):
         while self.running:
@@ -233,20 +447,32 @@ class VoiceRecognitionManager:
                 intent = self.intentifier.classify_intent(text)
                 if intent:
                     await self._execute(intent)
+                    self._recognized += 1
+            self._publish_status()
 
     async def _execute(self, intent: VoiceIntent):
         await self.sb.execute_action(intent.command, intent.parameters)
 
     async def stop(self):
         self.running = False
+        if self._server:
+            # Let uvicorn close its connections instead of cancelling it mid-request
+            self._server.should_exit = True
         for t in self.tasks:
-            t.cancel()
+            if t is not self._server_task:
+                t.cancel()
         await asyncio.gather(*self.tasks, return_exceptions=True)
-        if self.sb.ws:
-            await self.sb.ws.close()
+        await self.sb.close()
+        self._publish_status()
 
 # Example usage
 if __name__ == '__main__':
+    try:
+        import uvloop  # Not available on Windows; keep the default loop there
+        uvloop.install()
+    except ImportError:
+        pass
+
     logging.basicConfig(level=logging.INFO)
     config = VoiceConfig()
     vrm = VoiceRecognitionManager(config)